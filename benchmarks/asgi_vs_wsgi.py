@@ -0,0 +1,130 @@
+"""
+Пропускная способность чтения новостей под WSGI и под ASGI.
+
+Один процесс обслуживает CONCURRENCY медленных клиентов: отправка
+ответа каждому клиенту занимает SLOW_CLIENT секунд. Под WSGI запрос
+занимает один из WSGI_THREADS потоков до конца отправки, под ASGI
+ожидание отправки не занимает поток.
+
+Запуск из корня проекта:
+    python -m benchmarks.asgi_vs_wsgi
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+CONCURRENCY = 100
+REQUESTS = 400
+WSGI_THREADS = 8
+SLOW_CLIENT = 0.1
+COMMENTS = 200
+
+
+def setup(database):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DATABASES['default']['NAME'] = database
+    settings.ALLOWED_HOSTS = ['*']
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    from django.contrib.auth import get_user_model
+    from news.models import Comment, News
+
+    news = News.objects.create(title='Новость', text='Текст новости')
+    author = get_user_model().objects.create(username='Автор')
+    Comment.objects.bulk_create(
+        Comment(
+            news=news, author=author, author_username=author.username,
+            text=f'Комментарий {index}',
+        )
+        for index in range(COMMENTS)
+    )
+    return f'/news/{news.pk}/'
+
+
+def run_wsgi(path):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    application = WSGIHandler()
+
+    def request(_):
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+            'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+        }
+        body = application(environ, lambda status, headers: None)
+        for _ in body:
+            time.sleep(SLOW_CLIENT)
+        body.close()
+
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+        list(executor.map(request, range(REQUESTS)))
+
+
+def run_asgi(path):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def request(semaphore):
+        async with semaphore:
+            scope = {
+                'type': 'http', 'method': 'GET', 'path': path,
+                'query_string': b'', 'headers': [],
+                'server': ('localhost', 80),
+            }
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.body':
+                    await asyncio.sleep(SLOW_CLIENT)
+
+            await application(scope, receive, send)
+
+    async def main():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        await asyncio.gather(*(request(semaphore) for _ in range(REQUESTS)))
+
+    asyncio.run(main())
+
+
+def worker(mode, database):
+    path = setup(database)
+    start = time.perf_counter()
+    {'wsgi': run_wsgi, 'asgi': run_asgi}[mode](path)
+    print(f'{REQUESTS / (time.perf_counter() - start):.0f}')
+
+
+def main():
+    print(f'{"режим":<6} {"запросов/с":>11}')
+    for mode in ('wsgi', 'asgi'):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, YANEWS_ASYNC_VIEWS=str(int(mode == 'asgi')))
+            output = subprocess.run(
+                (
+                    sys.executable, '-m', 'benchmarks.asgi_vs_wsgi',
+                    mode, str(Path(directory) / 'db.sqlite3'),
+                ),
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        print(f'{mode:<6} {output.strip():>11}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        worker(*sys.argv[1:])
+    else:
+        main()
@@ -0,0 +1,94 @@
+"""
+Пропускная способность записи комментариев: транзакция на каждый
+комментарий против отложенной записи пачками.
+
+Несколько потоков, как обработчики запросов во время всплеска,
+одновременно добавляют комментарии. Замеряется время до записи всех
+комментариев и время, которое запрос проводит в записи.
+
+Запуск из корня проекта:
+    python -m benchmarks.comment_queue
+"""
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+THREADS = 8
+COMMENTS_PER_THREAD = 500
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+
+    from news.models import Comment, News
+    from news.writebehind import CommentQueue
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='Автор')
+    news = News.objects.create(title='Новость', text='Текст')
+    connection.close()
+
+    def build(thread, index):
+        return Comment(
+            news=news, author=author, author_username=author.username,
+            text=f'Комментарий {thread}-{index}',
+        )
+
+    def save(thread, latencies):
+        for index in range(COMMENTS_PER_THREAD):
+            start = time.perf_counter()
+            build(thread, index).save()
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+
+    queue = CommentQueue()
+
+    def enqueue(thread, latencies):
+        for index in range(COMMENTS_PER_THREAD):
+            start = time.perf_counter()
+            queue.put(build(thread, index))
+            latencies.append(time.perf_counter() - start)
+
+    total = THREADS * COMMENTS_PER_THREAD
+    print(
+        f'{"режим":<24} {"комментариев/с":>15} '
+        f'{"мкс в запросе":>14}'
+    )
+    for name, target in (
+        ('транзакция на запрос', save),
+        ('пачки в фоне', enqueue),
+    ):
+        Comment.objects.all().delete()
+        latencies = []
+        threads = [
+            threading.Thread(target=target, args=(number, latencies))
+            for number in range(THREADS)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        queue.flush()
+        elapsed = time.perf_counter() - start
+        assert Comment.objects.count() == total
+        print(
+            f'{name:<24} {total / elapsed:>15.0f} '
+            f'{sum(latencies) / len(latencies) * 1e6:>14.0f}'
+        )
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Задержка данных главной страницы в зависимости от размера БД.
+
+Для нескольких объёмов новостей с комментариями замеряется медиана
+построения снимка главной (запрос, который раньше выполнялся на каждый
+запрос страницы) и чтения готового снимка из кэша.
+
+Запуск из корня проекта:
+    python -m benchmarks.home_snapshot
+"""
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+SIZES = (1_000, 10_000, 100_000)
+COMMENTS_PER_NEWS = 10
+BATCH_SIZE = 10_000
+REPEATS = 200
+
+
+def measure(function):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from news.snapshot import build_home_snapshot, get_home_snapshot
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='Автор')
+    print(f'{"новостей":>9} {"мкс запрос":>11} {"мкс снимок":>11}')
+    created = 0
+    with connection.cursor() as cursor:
+        for size in SIZES:
+            for offset in range(created, size, BATCH_SIZE):
+                count = min(BATCH_SIZE, size - offset)
+                with transaction.atomic():
+                    cursor.executemany(
+                        'INSERT INTO news_news (title, text, date) '
+                        'VALUES (%s, %s, %s)',
+                        [
+                            (f'Новость {number}', 'Текст новости. ' * 20,
+                             '2024-01-01')
+                            for number in range(offset, offset + count)
+                        ],
+                    )
+                    cursor.execute(
+                        'INSERT INTO news_comment (news_id, author_id, '
+                        'author_username, text, created, modified) '
+                        'SELECT news.id, %s, %s, %s, '
+                        "datetime('now'), datetime('now') "
+                        'FROM news_news AS news, '
+                        '(SELECT 1 FROM news_news LIMIT %s) '
+                        'WHERE news.id > %s',
+                        [
+                            author.pk, author.username, 'Комментарий',
+                            COMMENTS_PER_NEWS, offset,
+                        ],
+                    )
+            created = size
+            query = measure(build_home_snapshot)
+            # Вставка мимо ORM не обновляет снимок, строим его заново.
+            cache.clear()
+            get_home_snapshot()
+            snapshot = measure(get_home_snapshot)
+            print(f'{size:>9} {query:>11.0f} {snapshot:>11.0f}')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Сравнение фильтра ругательств с прежним перебором слов.
+
+Запуск из корня проекта:
+    python -m benchmarks.profanity
+"""
+import random
+import timeit
+
+from news.profanity import RegexFilter
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+WORD_COUNTS = (10, 100, 1000, 5000)
+TEXT_WORDS = 200
+REPEAT = 200
+
+
+def random_word(rng):
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(5, 12)))
+
+
+def linear_find(words, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+def main():
+    rng = random.Random(0)
+    text = ' '.join(random_word(rng) for _ in range(TEXT_WORDS))
+    print(f'{"слов":>6} {"перебор, мкс":>14} {"RegexFilter, мкс":>18}')
+    for count in WORD_COUNTS:
+        words = [random_word(rng) for _ in range(count)]
+        profanity_filter = RegexFilter(words)
+        linear = timeit.timeit(lambda: linear_find(words, text), number=REPEAT)
+        regex = timeit.timeit(
+            lambda: profanity_filter.find(text), number=REPEAT
+        )
+        print(
+            f'{count:>6} {linear / REPEAT * 1e6:>14.1f} '
+            f'{regex / REPEAT * 1e6:>18.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
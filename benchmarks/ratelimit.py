@@ -0,0 +1,59 @@
+"""
+Стоимость проверки лимита частоты запросов.
+
+Замеряется вызов news.ratelimit.check_rate с ключами пользователя и
+IP-адреса, как в представлениях комментариев, для кэша в памяти
+процесса и для файлового кэша, общего для процессов на машине.
+
+Запуск из корня проекта:
+    python -m benchmarks.ratelimit
+"""
+import os
+import tempfile
+import time
+
+CHECKS = 100_000
+USERS = 1000
+LIMITS = {'user': (CHECKS, 60), 'ip': (CHECKS, 60)}
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    backends = (
+        ('locmem', 'django.core.cache.backends.locmem.LocMemCache', 1),
+        (
+            'filebased', 'django.core.cache.backends.filebased.FileBasedCache',
+            100,
+        ),
+    )
+    from django.core.cache import caches
+
+    from news.ratelimit import check_rate
+
+    print(f'{"кэш":<12} {"мкс/проверка":>13}')
+    for name, backend, divisor in backends:
+        settings.CACHES[name] = {
+            'BACKEND': backend, 'LOCATION': directory.name,
+        }
+        settings.RATE_LIMIT_CACHE = name
+        checks = CHECKS // divisor
+        start = time.perf_counter()
+        for number in range(checks):
+            check_rate(
+                'comments',
+                {'user': number % USERS, 'ip': f'10.0.0.{number % 250}'},
+                LIMITS,
+            )
+        elapsed = time.perf_counter() - start
+        print(f'{name:<12} {elapsed / checks * 1e6:>13.1f}')
+        caches[name].clear()
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
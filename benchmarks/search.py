@@ -0,0 +1,106 @@
+"""
+Задержка полнотекстового поиска на большом числе новостей.
+
+Новости собираются из синтетического словаря с частотами по закону
+Ципфа, самые частые слова в нём - служебные, как в настоящих текстах.
+Новости вставляются обычным INSERT, так что индекс заполняют триггеры.
+Для слов разной частоты замеряется медиана и 95-й перцентиль вызова
+news.search.search, включая загрузку новостей и сборку фрагментов.
+
+Запуск из корня проекта (объём задаётся SEARCH_NEWS):
+    SEARCH_NEWS=1000000 python -m benchmarks.search
+"""
+import os
+import random
+import tempfile
+import time
+from itertools import accumulate, product
+from pathlib import Path
+
+NEWS = int(os.getenv('SEARCH_NEWS', 100_000))
+WORDS_PER_NEWS = 60
+BATCH_SIZE = 10_000
+REPEATS = 50
+SYLLABLES = ('ка', 'ро', 'ми', 'на', 'сто', 'ве', 'ле', 'ти', 'пра', 'зо')
+ENDINGS = ('а', 'ами', 'ов', 'ой', 'ение', 'ость')
+
+
+def build_vocabulary(stop_words):
+    stems = [
+        ''.join(parts) for parts in product(SYLLABLES, repeat=3)
+    ]
+    return sorted(stop_words) + [
+        stem + ending for stem in stems for ending in ENDINGS
+    ]
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from news.search import STOP_WORDS, search
+
+    call_command('migrate', verbosity=0)
+    random.seed(0)
+    vocabulary = build_vocabulary(STOP_WORDS)
+    words = vocabulary[len(STOP_WORDS):]
+    weights = list(accumulate(
+        1 / rank for rank in range(1, len(vocabulary) + 1)
+    ))
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        for offset in range(0, NEWS, BATCH_SIZE):
+            rows = [
+                (
+                    ' '.join(random.choices(
+                        vocabulary, cum_weights=weights, k=3
+                    )),
+                    ' '.join(random.choices(
+                        vocabulary, cum_weights=weights, k=WORDS_PER_NEWS
+                    )),
+                    '2024-01-01',
+                )
+                for _ in range(min(BATCH_SIZE, NEWS - offset))
+            ]
+            with transaction.atomic():
+                cursor.executemany(
+                    'INSERT INTO news_news (title, text, date) '
+                    'VALUES (%s, %s, %s)',
+                    rows,
+                )
+    print(
+        f'{NEWS} новостей проиндексировано за '
+        f'{time.perf_counter() - start:.1f} с'
+    )
+    queries = (
+        ('частое слово', words[0]),
+        ('слово средней частоты', words[100]),
+        ('редкое слово', words[-1]),
+        ('два слова', f'{words[10]} {words[50]}'),
+        ('служебное слово', vocabulary[0]),
+        ('нет совпадений', 'отсутствующее'),
+    )
+    print(f'{"запрос":<24} {"медиана, мс":>12} {"p95, мс":>9}')
+    for name, query in queries:
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            search(query, 1, settings.SEARCH_RESULTS_PER_PAGE)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(
+            f'{name:<24} {timings[len(timings) // 2]:>12.2f} '
+            f'{timings[int(len(timings) * 0.95)]:>9.2f}'
+        )
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
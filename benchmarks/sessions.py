@@ -0,0 +1,72 @@
+"""
+Накладные расходы сессии на запрос авторизованного пользователя.
+
+Для каждого хранилища из SESSION_ENGINES замеряется время загрузки
+сессии, время запроса страницы входа, которая читает пользователя
+из сессии, и число обращений к таблице django_session.
+
+Запуск из корня проекта:
+    python -m benchmarks.sessions
+"""
+import os
+import tempfile
+import time
+from importlib import import_module
+from pathlib import Path
+
+REQUESTS = 500
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import (
+        CaptureQueriesContext, setup_test_environment
+    )
+    from django.urls import reverse
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+    user = get_user_model().objects.create(username='Читатель')
+    url = reverse('users:login')
+    print(
+        f'{"хранилище":<16} {"мкс/загрузка":>13} {"мкс/запрос":>11} '
+        f'{"запросов к сессиям":>19}'
+    )
+    for name, engine in settings.SESSION_ENGINES.items():
+        settings.SESSION_ENGINE = engine
+        client = Client()
+        client.force_login(user)
+        client.get(url)
+        store = import_module(engine).SessionStore
+        session_key = client.cookies[settings.SESSION_COOKIE_NAME].value
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            store(session_key).load()
+        load_time = time.perf_counter() - start
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                client.get(url)
+            elapsed = time.perf_counter() - start
+        session_queries = sum(
+            'django_session' in query['sql'] for query in queries
+        )
+        print(
+            f'{name:<16} {load_time / REQUESTS * 1e6:>13.0f} '
+            f'{elapsed / REQUESTS * 1e6:>11.0f} {session_queries:>19}'
+        )
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
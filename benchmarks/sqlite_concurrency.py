@@ -0,0 +1,114 @@
+"""
+Нагрузочная проверка: чтение во время записи комментариев в SQLite.
+
+Пишущий поток имитирует POST комментария: короткая транзакция
+со вставкой строки. Читающие потоки в это время выбирают страницу
+комментариев. Сравниваются журнал отката по умолчанию и настройки
+PRAGMAS из yanews/settings.py.
+
+Запуск из корня проекта:
+    python -m benchmarks.sqlite_concurrency
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from yanews.settings import DATABASES
+from yanews.sqlite3.base import apply_pragmas
+
+DURATION = 3
+READERS = 4
+TIMEOUT = DATABASES['default']['OPTIONS']['timeout']
+MODES = (
+    ('по умолчанию', {}),
+    ('PRAGMAS проекта', DATABASES['default']['PRAGMAS']),
+)
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(
+        path, timeout=TIMEOUT, isolation_level=None,
+        check_same_thread=False,
+    )
+    apply_pragmas(connection, pragmas)
+    return connection
+
+
+def writer(path, pragmas, stop, counter):
+    connection = connect(path, pragmas)
+    while not stop.is_set():
+        connection.execute('BEGIN IMMEDIATE')
+        connection.execute(
+            'INSERT INTO comment (news_id, text) VALUES (1, ?)', ('x' * 200,)
+        )
+        connection.execute('COMMIT')
+        counter.append(1)
+    connection.close()
+
+
+def reader(path, pragmas, stop, latencies):
+    connection = connect(path, pragmas)
+    while not stop.is_set():
+        start = time.perf_counter()
+        connection.execute(
+            'SELECT id, text FROM comment WHERE news_id = 1 '
+            'ORDER BY id DESC LIMIT 50'
+        ).fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    connection.close()
+
+
+def run(pragmas):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'db.sqlite3'
+        connection = connect(path, pragmas)
+        connection.execute(
+            'CREATE TABLE comment (id INTEGER PRIMARY KEY, '
+            'news_id INTEGER, text TEXT)'
+        )
+        connection.execute('CREATE INDEX comment_news ON comment (news_id)')
+        connection.close()
+        stop = threading.Event()
+        writes, latencies = [], []
+        threads = [threading.Thread(
+            target=writer, args=(path, pragmas, stop, writes)
+        )]
+        threads += [
+            threading.Thread(
+                target=reader, args=(path, pragmas, stop, latencies)
+            )
+            for _ in range(READERS)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    latencies.sort()
+    return (
+        len(writes) / DURATION,
+        len(latencies) / DURATION,
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+        latencies[-1],
+    )
+
+
+def main():
+    print(
+        f'{"режим":<16} {"записей/с":>10} {"чтений/с":>10} '
+        f'{"p50, мс":>9} {"p99, мс":>9} {"max, мс":>9}'
+    )
+    for name, pragmas in MODES:
+        writes, reads, p50, p99, worst = run(pragmas)
+        print(
+            f'{name:<16} {writes:>10.0f} {reads:>10.0f} '
+            f'{p50:>9.2f} {p99:>9.2f} {worst:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Задержка страниц «моих комментариев» у пользователя с большой историей.
+
+Один автор пишет COMMENTS комментариев к разным новостям. Замеряется
+медиана выборки первой страницы, страницы из середины истории и
+последней страницы через news.views.get_user_comments_page.
+
+Запуск из корня проекта:
+    USER_COMMENTS=1000000 python -m benchmarks.user_comments
+"""
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+COMMENTS = int(os.getenv('USER_COMMENTS', 200_000))
+NEWS = 1000
+BATCH_SIZE = 10_000
+REPEATS = 100
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from news.models import Comment
+    from news.pagination import encode_cursor
+    from news.views import get_user_comments_page
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='Автор')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with connection.cursor() as cursor:
+        with transaction.atomic():
+            cursor.executemany(
+                'INSERT INTO news_news (title, text, date) '
+                'VALUES (%s, %s, %s)',
+                [(f'Новость {number}', 'Текст', '2024-01-01')
+                 for number in range(NEWS)],
+            )
+        for offset in range(0, COMMENTS, BATCH_SIZE):
+            with transaction.atomic():
+                cursor.executemany(
+                    'INSERT INTO news_comment (news_id, author_id, '
+                    'author_username, text, created, modified) '
+                    'VALUES (%s, %s, %s, %s, %s, %s)',
+                    [
+                        (
+                            number % NEWS + 1, author.pk, author.username,
+                            f'Комментарий {number}',
+                            start + timedelta(seconds=number),
+                            start + timedelta(seconds=number),
+                        )
+                        for number in range(
+                            offset, min(offset + BATCH_SIZE, COMMENTS)
+                        )
+                    ],
+                )
+    ordered = Comment.objects.filter(author=author).order_by(
+        '-created', '-pk'
+    )
+    print(f'{"страница":<12} {"мкс":>8}')
+    for name, position in (
+        ('первая', None),
+        ('середина', COMMENTS // 2),
+        ('последняя', COMMENTS - settings.COMMENTS_COUNT_ON_USER_PAGE - 1),
+    ):
+        cursor = position and encode_cursor(
+            ordered.only('created')[position]
+        )
+        timings = []
+        for _ in range(REPEATS):
+            begin = time.perf_counter()
+            get_user_comments_page(author, cursor)
+            timings.append(time.perf_counter() - begin)
+        print(f'{name:<12} {statistics.median(timings) * 1e6:>8.0f}')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
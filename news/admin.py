@@ -1,15 +1,103 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
 from .models import Comment, News
 
+# Сколько последних комментариев показывается на странице новости.
+COMMENT_PREVIEW_SIZE = 20
+# Больше строк список комментариев не считает: сужайте поиском и
+# фильтром по новости.
+COMMENT_MAX_COUNT = 10_000
 
-class CommentInline(admin.StackedInline):
+
+class BoundedCountPaginator(Paginator):
+    """
+    Считает не больше COMMENT_MAX_COUNT строк.
+
+    COUNT(*) по всем комментариям или по большому обсуждению читает
+    весь индекс, а подсчёт с LIMIT - не больше заданного числа строк.
+    """
+
+    @cached_property
+    def count(self):
+        return self.object_list[:COMMENT_MAX_COUNT].count()
+
+
+class CommentPreviewFormSet(BaseInlineFormSet):
+    """Только последние COMMENT_PREVIEW_SIZE комментариев новости."""
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            # Отбор по новости делает BaseInlineFormSet, после среза
+            # QuerySet уже нельзя фильтровать.
+            self._queryset = super().get_queryset().order_by(
+                '-created'
+            )[:COMMENT_PREVIEW_SIZE]
+        return self._queryset
+
+
+class CommentInline(admin.TabularInline):
     model = Comment
+    formset = CommentPreviewFormSet
+    fields = readonly_fields = ('author_username', 'text', 'created')
+    verbose_name_plural = (
+        f'Последние {COMMENT_PREVIEW_SIZE} комментариев'
+    )
     extra = 0
+    can_delete = False
+    show_change_link = True
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
+    readonly_fields = ('all_comments',)
     inlines = [
         CommentInline,
     ]
+
+    @admin.display(description='Комментарии')
+    def all_comments(self, news):
+        if news.pk is None:
+            return '-'
+        return format_html(
+            '<a href="{}?news__id__exact={}">Все комментарии</a>',
+            reverse('admin:news_comment_changelist'), news.pk,
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'news', 'author_username', 'created')
+    list_select_related = ('news',)
+    raw_id_fields = ('news', 'author')
+    search_fields = ('author__username',)
+    paginator = BoundedCountPaginator
+    # Второй COUNT(*) по всей таблице ради «показать все» не нужен.
+    show_full_result_count = False
+
+    def get_ordering(self, request):
+        # Внутри новости или автора порядок даёт индекс (news, created)
+        # или (author, created), по всей таблице - первичный ключ.
+        if 'news__id__exact' in request.GET or request.GET.get('q'):
+            return ('-created',)
+        return ('-pk',)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Ищет комментарии по точному имени автора.
+
+        Поиск подстроки в тексте перебирал бы всю таблицу, а точное
+        имя находится по уникальному индексу, комментарии - по индексу
+        (author, created).
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(author__username=search_term), False
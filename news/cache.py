@@ -0,0 +1,176 @@
+from hashlib import md5
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+
+from yanews.routers import read_primary
+
+HOME_CACHE_KEY = 'news:home'
+DETAIL_CACHE_KEY = 'news:detail:{pk}'
+VERSION_KEY = '{key}:version'
+
+
+def get_detail_cache_key(pk):
+    return DETAIL_CACHE_KEY.format(pk=pk)
+
+
+def get_version(key):
+    """
+    Текущая версия закэшированного ответа.
+
+    Инвалидация увеличивает версию, а не удаляет ответ: так ответ,
+    отрисованный по устаревшим данным во время инвалидации, сохранится
+    под старой версией и больше не будет прочитан. Новая версия берётся
+    из текущего времени: если ключ версии вытеснили из кэша, счёт не
+    начнётся заново и не вернётся к версии, под которой лежит старый ответ.
+    """
+    return cache.get_or_set(VERSION_KEY.format(key=key), time_ns, None)
+
+
+def bump_version(key):
+    """Увеличивает версию ключа и возвращает новую."""
+    version_key = VERSION_KEY.format(key=key)
+    try:
+        return cache.incr(version_key)
+    except ValueError:
+        # Версию вытеснили из кэша, а ответы под прежними версиями
+        # могли остаться.
+        version = time_ns()
+        cache.set(version_key, version, None)
+        return version
+
+
+def invalidate(*keys):
+    for key in keys:
+        bump_version(key)
+
+
+def invalidate_news(news_id):
+    """Сбрасывает закэшированные главную страницу и страницу новости."""
+    invalidate(HOME_CACHE_KEY, get_detail_cache_key(news_id))
+
+
+def make_etag(*values):
+    """
+    Слабый ETag по данным страницы.
+
+    Слабый, потому что страница с формой при каждой отрисовке получает
+    новую маску CSRF-токена и побайтно не совпадает.
+    """
+    return f'W/"{md5(repr(values).encode()).hexdigest()}"'
+
+
+def revalidate(request, response):
+    """Отвечает 304 на условный запрос, если готовый ответ не изменился."""
+    return get_conditional_response(
+        request, etag=response.get('ETag'), response=response
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы с ETag.
+
+    ETag вычисляется по данным, которые загружает load(), до отрисовки
+    шаблона. Если страница у клиента не устарела, он получает 304 без
+    загрузки остальных данных и отрисовки.
+
+    Last-Modified не отдаётся: время изменения страницы не выводится из
+    её данных. Правка новости его не меняет, а после удаления последнего
+    комментария или новости с главной оно уходит назад, и клиент с
+    If-Modified-Since получил бы 304 на устаревшую страницу.
+    """
+
+    def load(self):
+        """Загружает данные, по которым вычисляются валидаторы."""
+        raise NotImplementedError
+
+    def get_etag_data(self):
+        """Значения, от которых зависит содержимое страницы."""
+        raise NotImplementedError
+
+    def get_etag(self):
+        user = self.request.user
+        if not user.is_authenticated:
+            return make_etag(self.get_etag_data())
+        # Страница зависит от пользователя, а форма комментария - ещё и
+        # от CSRF-куки, которая меняется при входе.
+        return make_etag(
+            self.get_etag_data(), user.pk,
+            self.request.META.get('CSRF_COOKIE'),
+        )
+
+    def set_validators(self, response):
+        response['ETag'] = self.etag
+        return response
+
+    def load_page(self):
+        """
+        Загружает страницу: пара из ответа 304 или None и контекста.
+
+        Контекст собирается, только если страницу нужно отрисовать.
+        """
+        self.load()
+        self.etag = self.get_etag()
+        response = get_conditional_response(self.request, etag=self.etag)
+        if response is not None:
+            return response, None
+        return None, self.get_context_data()
+
+    def get(self, request, *args, **kwargs):
+        response, context = self.load_page()
+        if response is None:
+            response = self.render_to_response(context)
+        return self.set_validators(response)
+
+
+class AnonymousCacheMixin:
+    """
+    Кэширует ответы анонимным пользователям.
+
+    Ответ сбрасывается сигналами при изменении новостей и комментариев,
+    см. news/signals.py, и хранится не дольше NEWS_CACHE_TIMEOUT: сигналы
+    не достают кэш в памяти других процессов.
+    """
+
+    def get_cache_key(self):
+        raise NotImplementedError
+
+    def is_cacheable(self):
+        return (
+            self.request.method == 'GET'
+            and not self.request.GET
+            and not self.request.user.is_authenticated
+        )
+
+    def get_cached_response(self):
+        self.cache_key = self.get_cache_key()
+        self.cache_version = get_version(self.cache_key)
+        return cache.get(self.cache_key, version=self.cache_version)
+
+    def cache_response(self, response):
+        """Сохраняет ответ в кэш, когда он будет отрисован."""
+        key, version = self.cache_key, self.cache_version
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key, response, settings.NEWS_CACHE_TIMEOUT,
+                    version=version,
+                )
+            )
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable():
+            return super().dispatch(request, *args, **kwargs)
+        response = self.get_cached_response()
+        if response is None:
+            # Ответ хранится до изменения данных, поэтому не читается с
+            # отстающей реплики.
+            read_primary()
+            return self.cache_response(
+                super().dispatch(request, *args, **kwargs)
+            )
+        return revalidate(request, response)
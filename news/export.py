@@ -0,0 +1,105 @@
+"""
+Потоковая выгрузка новостей вместе с комментариями.
+
+Новости читаются пачками по ключу, комментарии каждой пачки - одним
+запросом через iterator(), поэтому память не зависит от объёма данных.
+"""
+import csv
+import json
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, News
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 2000
+NEWS_FIELDS = ('id', 'title', 'text', 'date')
+COMMENT_FIELDS = (
+    'id', 'news_id', 'author_id', 'author_username', 'text', 'created'
+)
+CSV_FIELDS = (
+    'record', 'id', 'news_id', 'author_id', 'author_username', 'title',
+    'text', 'date', 'created',
+)
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def iter_news_batches(batch_size=BATCH_SIZE):
+    last_id = 0
+    while True:
+        batch = list(
+            News.objects.filter(pk__gt=last_id).order_by('pk').values(
+                *NEWS_FIELDS
+            )[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]['id']
+
+
+def iter_news_with_comments(batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE):
+    """
+    Пары (новость, итератор её комментариев).
+
+    Итератор комментариев нужно дочитать до перехода к следующей новости.
+    """
+    for batch in iter_news_batches(batch_size):
+        comments = Comment.objects.filter(
+            news_id__gte=batch[0]['id'], news_id__lte=batch[-1]['id']
+        ).order_by('news_id', 'created', 'pk').values(
+            *COMMENT_FIELDS
+        ).iterator(chunk_size=chunk_size)
+        groups = groupby(comments, key=itemgetter('news_id'))
+        group = next(groups, None)
+        for news in batch:
+            if group is not None and group[0] == news['id']:
+                yield news, group[1]
+                group = next(groups, None)
+            else:
+                yield news, iter(())
+
+
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def export_jsonl(news_with_comments):
+    """Одна строка на новость, комментарии вложены в поле comments."""
+    for news, comments in news_with_comments:
+        yield f'{dumps(news)[:-1]}, "comments": ['
+        for index, comment in enumerate(comments):
+            yield f'{", " if index else ""}{dumps(comment)}'
+        yield ']}\n'
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_csv(news_with_comments):
+    """Строка новости, за которой идут строки её комментариев."""
+    writer = csv.DictWriter(Echo(), fieldnames=CSV_FIELDS)
+    yield writer.writeheader()
+    for news, comments in news_with_comments:
+        yield writer.writerow({'record': 'news', **news})
+        for comment in comments:
+            yield writer.writerow({'record': 'comment', **comment})
+
+
+EXPORTERS = {
+    'jsonl': export_jsonl,
+    'csv': export_csv,
+}
+
+
+def export(format, **kwargs):
+    return EXPORTERS[format](iter_news_with_comments(**kwargs))
@@ -0,0 +1,94 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.forms.renderers import get_default_renderer
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+from yanews.warmup import get_template_names
+
+
+def get_directories(engine):
+    """Каталоги всех загрузчиков, в том числе обёрнутых кэширующим."""
+    directories = []
+    for loader in engine.template_loaders:
+        for directory in loader.get_dirs():
+            if directory not in directories:
+                directories.append(directory)
+    return directories
+
+
+def get_referenced_names(template):
+    """
+    Постоянные имена шаблонов из {% extends %} и {% include %}.
+
+    Их Django загружает только при отрисовке, так что отсутствующий
+    шаблон иначе нашёлся бы на первом запросе.
+    """
+    for node in template.nodelist.get_nodes_by_type(ExtendsNode):
+        if isinstance(node.parent_name.var, str):
+            yield node.parent_name.var
+    for node in template.nodelist.get_nodes_by_type(IncludeNode):
+        if isinstance(node.template.var, str):
+            yield node.template.var
+
+
+def find_template(name, engine):
+    """
+    Ищет шаблон в движке проекта и в движке виджетов форм.
+
+    Шаблоны виджетов admin подключают шаблоны django/forms, которые
+    есть только у движка, отрисовывающего формы.
+    """
+    try:
+        engine.get_template(name)
+    except TemplateDoesNotExist:
+        get_default_renderer().get_template(name)
+
+
+def compile_templates(engine):
+    """Разбирает все шаблоны движка: пара из их числа и списка ошибок."""
+    names = {
+        name
+        for directory in get_directories(engine.engine)
+        for name in get_template_names(directory)
+    }
+    errors = []
+    for name in sorted(names):
+        try:
+            template = engine.get_template(name).template
+            for referenced in get_referenced_names(template):
+                find_template(referenced, engine)
+        except TemplateSyntaxError as error:
+            errors.append(f'{name}: {error}')
+        except TemplateDoesNotExist as error:
+            errors.append(f'{name}: не найден шаблон {error}')
+    return len(names), errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Разбирает все шаблоны проекта и приложений и завершается '
+        'с ошибкой, если какой-то шаблон не разбирается или ссылается '
+        'на несуществующий. Шаг сборки перед выкладкой.'
+    )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        count = 0
+        errors = []
+        for engine in engines.all():
+            if isinstance(engine, DjangoTemplates):
+                engine_count, engine_errors = compile_templates(engine)
+                count += engine_count
+                errors += engine_errors
+        if errors:
+            raise CommandError(
+                f'Ошибки в шаблонах ({len(errors)}):\n' + '\n'.join(errors)
+            )
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Разобрано шаблонов: {count} за '
+                f'{(perf_counter() - start) * 1000:.0f} мс.'
+            ))
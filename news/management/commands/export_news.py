@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from news.export import BATCH_SIZE, EXPORTERS, export
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает новости с комментариями в JSONL или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=tuple(EXPORTERS), default='jsonl',
+            help='Формат выгрузки.',
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл для выгрузки, "-" - стандартный вывод.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Сколько новостей читать одним запросом.',
+        )
+
+    def handle(self, *args, format, output, batch_size, **options):
+        chunks = export(format, batch_size=batch_size)
+        if output == '-':
+            sys.stdout.writelines(chunks)
+            return
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            file.writelines(chunks)
@@ -0,0 +1,140 @@
+import csv
+import json
+import sys
+from datetime import date
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from news.cache import HOME_CACHE_KEY, invalidate
+from news.models import News
+from news.snapshot import refresh_home_snapshot
+
+FORMATS = ('jsonl', 'csv')
+TITLE_MAX_LENGTH = News._meta.get_field('title').max_length
+
+
+def read_jsonl(file):
+    """
+    Записи из строк JSONL. Вместо записи из испорченной строки
+    возвращается ошибка разбора, чтобы импорт пропустил только её.
+    """
+    for line in file:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield error
+
+
+def read_csv(file):
+    yield from csv.DictReader(file)
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует новости из JSONL или CSV с полями '
+        'title, text и необязательным date (ГГГГ-ММ-ДД). Новости с уже '
+        'существующей парой (title, date) пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл для импорта, "-" - стандартный ввод.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Формат файла, по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько новостей записывать в одной транзакции.',
+        )
+
+    def handle(self, *args, path, format, batch_size, **options):
+        format = format or path.rsplit('.', 1)[-1]
+        if format not in FORMATS:
+            raise CommandError(
+                f'Укажите формат: {", ".join(FORMATS)}.'
+            )
+        self.verbosity = options['verbosity']
+        self.created = self.duplicates = self.errors = 0
+        start = perf_counter()
+        if path == '-':
+            self.import_news(READERS[format](sys.stdin), batch_size)
+        else:
+            with open(path, encoding='utf-8', newline='') as file:
+                self.import_news(READERS[format](file), batch_size)
+        # bulk_create не отправляет сигналы, поэтому сбрасываем кэш сами.
+        # Серверу это видно, только если кэш default общий: кэш в памяти
+        # процессов сервера команда не достаёт, и там главная обновится
+        # через NEWS_CACHE_TIMEOUT.
+        invalidate(HOME_CACHE_KEY)
+        refresh_home_snapshot()
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано: {self.created}, дублей: {self.duplicates}, '
+            f'ошибок: {self.errors} за {elapsed:.1f} с '
+            f'({self.created / elapsed:.0f} новостей/с).'
+        ))
+
+    def import_news(self, records, batch_size):
+        for batch in batched(self.build_news(records), batch_size):
+            with transaction.atomic():
+                self.created += len(News.objects.bulk_create(
+                    self.exclude_duplicates(batch)
+                ))
+            if self.verbosity > 1:
+                self.stdout.write(f'Импортировано: {self.created}')
+
+    def build_news(self, records):
+        for number, record in enumerate(records, start=1):
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                raw_date = record.get('date')
+                news = News(
+                    title=record['title'].strip(),
+                    text=record['text'],
+                    date=(
+                        date.fromisoformat(raw_date) if raw_date
+                        else date.today()
+                    ),
+                )
+                if not news.title or len(news.title) > TITLE_MAX_LENGTH:
+                    raise ValueError('некорректный заголовок')
+                # В короткой строке CSV недостающие поля равны None.
+                if not isinstance(news.text, str) or not news.text:
+                    raise ValueError('некорректный текст')
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                self.errors += 1
+                self.stderr.write(f'Запись {number} пропущена: {error!r}')
+                continue
+            yield news
+
+    def exclude_duplicates(self, batch):
+        """Отбрасывает повторы внутри пачки и уже сохранённые новости."""
+        seen = set(News.objects.filter(
+            title__in={news.title for news in batch},
+            date__in={news.date for news in batch},
+        ).values_list('title', 'date'))
+        unique = []
+        for news in batch:
+            key = (news.title, news.date)
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            unique.append(news)
+        return unique
@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Выполняется в новом процессе: импорт WSGI-приложения (вместе с прогревом,
+# если он включён) и два запроса к нему напрямую, без тестового клиента.
+SCRIPT = '''
+import json, sys
+from io import BytesIO
+from time import perf_counter
+
+start = perf_counter()
+from yanews.wsgi import application
+timings = {'startup': perf_counter() - start}
+
+
+def request(path):
+    statuses = []
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+    }
+    start = perf_counter()
+    response = application(environ, lambda status, headers: statuses.append(
+        status
+    ))
+    b''.join(response)
+    response.close()
+    return perf_counter() - start, statuses[0]
+
+
+timings['first_request'], status = request(sys.argv[1])
+timings['second_request'], _ = request(sys.argv[1])
+print(json.dumps({'timings': timings, 'status': status}))
+'''
+IMPORT_TIME_PREFIX = 'import time:'
+
+
+def parse_import_time(lines):
+    """
+    Собственное время импорта модулей в микросекундах из вывода
+    python -X importtime.
+    """
+    modules = {}
+    for line in lines:
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        own, _, name = line[len(IMPORT_TIME_PREFIX):].split('|')
+        if own.strip().isdigit():
+            modules[name.strip()] = int(own)
+    return modules
+
+
+def group_by_package(modules):
+    packages = defaultdict(int)
+    for name, own in modules.items():
+        packages[name.partition('.')[0]] += own
+    return packages
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт в новом процессе: время импорта модулей '
+        '(python -X importtime), запуска приложения и первого запроса, '
+        'без прогрева и с прогревом из yanews/warmup.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=str(settings.LOGIN_URL),
+            help='Адрес, который запрашивается после запуска.',
+        )
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Сколько самых долгих пакетов и модулей показать.',
+        )
+
+    def run(self, path, warmup):
+        environment = {
+            **os.environ,
+            'YANEWS_WARMUP': '1' if warmup else '0',
+            'DJANGO_SETTINGS_MODULE': os.environ['DJANGO_SETTINGS_MODULE'],
+        }
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT, path],
+            capture_output=True, text=True, env=environment,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        return (
+            json.loads(result.stdout.splitlines()[-1]),
+            parse_import_time(result.stderr.splitlines()),
+        )
+
+    def write_top(self, title, times, top):
+        self.stdout.write(f'{title:<48} {"мс":>8}')
+        for name, own in sorted(
+            times.items(), key=lambda item: item[1], reverse=True
+        )[:top]:
+            self.stdout.write(f'{name:<48} {own / 1000:>8.1f}')
+        self.stdout.write('')
+
+    def handle(self, *args, path, top, **options):
+        cold, modules = self.run(path, warmup=False)
+        warm, _ = self.run(path, warmup=True)
+        self.stdout.write(
+            f'Импорт: {len(modules)} модулей за '
+            f'{sum(modules.values()) / 1000:.1f} мс.\n'
+        )
+        self.write_top('Пакет', group_by_package(modules), top)
+        self.write_top('Модуль', modules, top)
+        self.stdout.write(
+            f'{"":<16} {"запуск, мс":>12} {"1-й запрос, мс":>16} '
+            f'{"2-й запрос, мс":>16}'
+        )
+        for name, result in (('без прогрева', cold), ('с прогревом', warm)):
+            timings = result['timings']
+            self.stdout.write(
+                f'{name:<16} {timings["startup"] * 1000:>12.1f} '
+                f'{timings["first_request"] * 1000:>16.1f} '
+                f'{timings["second_request"] * 1000:>16.1f}'
+            )
+        self.stdout.write(f'Ответ {path}: {cold["status"]}.')
@@ -0,0 +1,55 @@
+import sqlite3
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def replicate(source, path):
+    """
+    Копирует базу SQLite source в файл path через backup API.
+
+    Копия пишется одной транзакцией: в режиме WAL читатели реплики
+    не ждут её и видят либо старые данные, либо новые целиком.
+    """
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу в реплики из REPLICA_DATABASES, '
+        'см. yanews/routers.py.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд, 0 - скопировать один раз.',
+        )
+
+    def handle(self, *args, interval, **options):
+        if not settings.REPLICA_DATABASES:
+            raise CommandError(
+                'Реплики не настроены, задайте YANEWS_DATABASE_REPLICAS.'
+            )
+        source = connections[DEFAULT_DB_ALIAS]
+        while True:
+            start = perf_counter()
+            source.ensure_connection()
+            for alias in settings.REPLICA_DATABASES:
+                replicate(
+                    source.connection, settings.DATABASES[alias]['NAME']
+                )
+            if options['verbosity']:
+                self.stdout.write(
+                    f'Реплик обновлено: {len(settings.REPLICA_DATABASES)} '
+                    f'за {(perf_counter() - start) * 1000:.0f} мс.'
+                )
+            if not interval:
+                break
+            sleep(interval)
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:37
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created(apps, schema_editor):
+    Comment = apps.get_model('news', 'Comment')
+    Comment.objects.update(modified=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_news_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_created, migrations.RunPython.noop),
+    ]
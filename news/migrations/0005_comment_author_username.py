@@ -0,0 +1,31 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:44
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_usernames(apps, schema_editor):
+    Comment = apps.get_model('news', 'Comment')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Comment.objects.update(author_username=Subquery(
+        User.objects.filter(pk=OuterRef('author_id')).values('username')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('news', '0004_news_title_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='author_username',
+            field=models.CharField(default='', editable=False, max_length=150),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_usernames, migrations.RunPython.noop),
+    ]
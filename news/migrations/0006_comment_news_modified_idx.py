@@ -0,0 +1,17 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_comment_author_username'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['news', 'modified'], name='comment_news_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Основы слов вычисляет функция news_stem, которую приложение регистрирует
+# в каждом соединении, см. news/search.py.
+CREATE_INDEX = (
+    "CREATE VIRTUAL TABLE news_search USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 0')",
+    "INSERT INTO news_search (rowid, title, text) "
+    "SELECT id, news_stem(title), news_stem(text) FROM news_news",
+    """
+    CREATE TRIGGER news_search_insert AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_search (rowid, title, text)
+        VALUES (new.id, news_stem(new.title), news_stem(new.text));
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_update AFTER UPDATE OF title, text
+    ON news_news BEGIN
+        UPDATE news_search
+        SET title = news_stem(new.title), text = news_stem(new.text)
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER news_search_delete AFTER DELETE ON news_news BEGIN
+        DELETE FROM news_search WHERE rowid = old.id;
+    END
+    """,
+)
+DROP_INDEX = (
+    'DROP TRIGGER news_search_delete',
+    'DROP TRIGGER news_search_update',
+    'DROP TRIGGER news_search_insert',
+    'DROP TABLE news_search',
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_comment_news_modified_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
@@ -11,6 +11,11 @@ class News(models.Model):
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date',), name='news_date_idx'),
+            # Естественный ключ, по которому импорт отбрасывает дубли.
+            models.Index(fields=('title', 'date'), name='news_title_date_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -27,11 +32,47 @@ class Comment(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    # Копия имени автора: комментарии выводятся без обращения к таблице
+    # пользователей. Обновляется сигналом при смене имени.
+    author_username = models.CharField(max_length=150, editable=False)
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created'), name='comment_news_created_idx'
+            ),
+            # Число комментариев и время последней правки для ETag.
+            models.Index(
+                fields=('news', 'modified'),
+                name='comment_news_modified_idx',
+            ),
+            models.Index(
+                fields=('author', 'created'),
+                name='comment_author_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        comment = super().from_db(db, field_names, values)
+        # Автор, с которым комментарий прочитан, см. save().
+        comment._loaded_author_id = comment.__dict__.get('author_id')
+        return comment
+
+    def save(self, *args, **kwargs):
+        # Имя обновляется и при смене автора, например в админке.
+        loaded_author_id = getattr(self, '_loaded_author_id', None)
+        if not self.author_username or (
+            loaded_author_id is not None
+            and loaded_author_id != self.author_id
+        ):
+            self.author_username = self.author.get_username()
+        super().save(*args, **kwargs)
+        self._loaded_author_id = self.author_id
@@ -0,0 +1,64 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime, timezone
+
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+
+CURSOR_SEPARATOR = '|'
+# Наибольший pk BigAutoField. Больший SQLite не принимает как параметр.
+MAX_PK = 2 ** 63 - 1
+
+
+def encode_cursor(obj, field='created'):
+    """Кодирует позицию объекта в ленте в строку для URL."""
+    value = f'{getattr(obj, field).isoformat()}{CURSOR_SEPARATOR}{obj.pk}'
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Раскодирует курсор в пару (значение поля, pk)."""
+    try:
+        value = urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, pk = value.split(CURSOR_SEPARATOR)
+        pk = int(pk)
+        if not 0 < pk <= MAX_PK:
+            raise ValueError(pk)
+        value = datetime.fromisoformat(timestamp)
+        if value.tzinfo is None:
+            raise ValueError(timestamp)
+        # Django переводит время в UTC при построении запроса, и время
+        # у границ диапазона дат переполнилось бы уже там.
+        return value.astimezone(timezone.utc), pk
+    except (BinasciiError, OverflowError, UnicodeError, ValueError):
+        raise BadRequest('Некорректный курсор.')
+
+
+def paginate_by_keyset(
+    queryset, cursor, limit, field='created', descending=False
+):
+    """
+    Возвращает страницу объектов после курсора и курсор следующей страницы.
+
+    Объекты упорядочены по паре (field, pk), с descending - от больших
+    к меньшим, поэтому стоимость выборки не зависит от того, насколько
+    далеко от начала находится страница.
+    """
+    prefix, after = ('-', 'lt') if descending else ('', 'gt')
+    queryset = queryset.order_by(f'{prefix}{field}', f'{prefix}pk')
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            # Условие с OR SQLite не превращает в диапазон индекса и
+            # перебирает записи до курсора. Лишняя граница по полю
+            # позволяет начать чтение индекса сразу с курсора.
+            Q(**{f'{field}__{after}e': value}),
+            Q(**{f'{field}__{after}': value})
+            | Q(**{field: value, f'pk__{after}': pk}),
+        )
+    page = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1], field)
+    return page, next_cursor
@@ -0,0 +1,101 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Буквы, которыми подменяют друг друга, приводятся к одному написанию.
+NORMALIZATION = (
+    ('ё', 'е'),
+    ('a', 'а'),
+    ('c', 'с'),
+    ('e', 'е'),
+    ('k', 'к'),
+    ('o', 'о'),
+    ('p', 'р'),
+    ('x', 'х'),
+    ('y', 'у'),
+)
+
+
+def normalize(text):
+    # Цепочка str.replace заметно быстрее str.translate со словарём.
+    text = text.casefold()
+    for old, new in NORMALIZATION:
+        text = text.replace(old, new)
+    return text
+
+
+def load_words(path):
+    """Читает словарь: одно слово или фраза в строке, # - комментарий."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            word = line.split('#', 1)[0].strip()
+            if word:
+                yield word
+
+
+def build_trie_pattern(words):
+    """
+    Собирает регулярное выражение из префиксного дерева слов.
+
+    В отличие от простого перечисления через |, движку не нужно
+    перебирать все слова в каждой позиции текста: общие префиксы
+    проверяются один раз.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [
+        re.escape(char) + _node_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    if len(branches) == 1:
+        pattern = branches[0]
+    else:
+        pattern = f'(?:{"|".join(branches)})'
+    if '' in node:
+        pattern = f'(?:{pattern})?'
+    return pattern
+
+
+class RegexFilter:
+    """Ищет запрещённые слова целиком одним скомпилированным выражением."""
+
+    def __init__(self, words):
+        words = {normalize(word.strip()) for word in words if word.strip()}
+        self.pattern = None
+        if words:
+            self.pattern = re.compile(
+                rf'\b{build_trie_pattern(words)}\b'
+            )
+
+    def find(self, text):
+        """Возвращает первое найденное запрещённое слово или None."""
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(normalize(text))
+        return match.group() if match else None
+
+
+@lru_cache(maxsize=None)
+def get_profanity_filter(words):
+    """
+    Фильтр строится один раз на процесс.
+
+    Класс фильтра задаётся настройкой PROFANITY_FILTER, к словам из кода
+    добавляется словарь из файла BAD_WORDS_FILE, если он указан.
+    """
+    words = list(words)
+    if settings.BAD_WORDS_FILE:
+        words.extend(load_words(settings.BAD_WORDS_FILE))
+    return import_string(settings.PROFANITY_FILTER)(words)
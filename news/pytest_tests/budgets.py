@@ -0,0 +1,49 @@
+"""
+Бюджеты запросов к БД, прочитанных строк и времени ответа для маршрутов.
+
+Строки считаются по результатам запросов, которые получил курсор, во что
+бы они ни превращались: в модели, словари или кортежи. Время - 95-й
+перцентиль при холодном кэше, в миллисекундах, с запасом на медленные
+машины. Меняйте бюджет только вместе с изменением, которое его объясняет.
+"""
+from collections import namedtuple
+
+# rows=None - маршрут по назначению читает все данные, и бюджет строк
+# для него ничего не ограничивал бы.
+Budget = namedtuple('Budget', ('queries', 'rows', 'p95_ms'))
+
+BUDGETS = {
+    # Снимок главной при холодном кэше: новости вместе с числом
+    # комментариев, словарями, а не моделями.
+    'news:home': Budget(queries=1, rows=10, p95_ms=100),
+    # Новость и страница комментариев, плюс одна строка для проверки,
+    # есть ли следующая страница. Авторы не загружаются.
+    'news:detail': Budget(queries=2, rows=52, p95_ms=250),
+    # Проверка новости и страница комментариев.
+    'news:comments': Budget(queries=2, rows=52, p95_ms=250),
+    # Страница новостей вместе с поисковым индексом и одна строка для
+    # проверки, есть ли следующая страница.
+    'news:search': Budget(queries=1, rows=11, p95_ms=100),
+    # Пользователь и страница комментариев вместе с новостями плюс одна
+    # строка для проверки, есть ли следующая страница.
+    'news:user_comments': Budget(queries=2, rows=52, p95_ms=250),
+    'news:user_comments_json': Budget(queries=2, rows=52, p95_ms=100),
+    # Пользователь и комментарий вместе с новостью, сессия - из кэша.
+    'news:edit': Budget(queries=2, rows=2, p95_ms=100),
+    'news:delete': Budget(queries=2, rows=2, p95_ms=100),
+    # Пользователь, пачка новостей, её комментарии и пустая пачка,
+    # которая завершает выгрузку. Выгрузка читает все новости и
+    # комментарии, ограничена лишь память: пачки не накапливаются.
+    # Следующие пачки - см. BATCH_BUDGETS.
+    'news:export': Budget(queries=4, rows=None, p95_ms=500),
+    'users:login': Budget(queries=0, rows=0, p95_ms=100),
+    'users:logout': Budget(queries=0, rows=0, p95_ms=100),
+    'users:signup': Budget(queries=0, rows=0, p95_ms=100),
+}
+
+# Добавка к бюджету за каждую пачку сверх первой, если маршрут читает
+# данные пачками. Выгрузка: пачка из news.export.BATCH_SIZE новостей и
+# комментарии к ним.
+BATCH_BUDGETS = {
+    'news:export': Budget(queries=2, rows=0, p95_ms=250),
+}
@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.core.cache import cache, caches
 from django.test.client import Client
+from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils import timezone
 import pytest
 
 from .constants import (
@@ -11,6 +14,27 @@ from .constants import (
 from news.models import Comment, News
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached responses must not leak between tests."""
+    cache.clear()
+    caches['fragments'].clear()
+    caches['ratelimit'].clear()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def session_cache(tmp_path_factory):
+    """Sessions are stored in a temporary directory, not in the project."""
+    with override_settings(CACHES={
+        **settings.CACHES,
+        'sessions': {
+            **settings.CACHES['sessions'],
+            'LOCATION': tmp_path_factory.mktemp('sessions'),
+        },
+    }):
+        yield
+
+
 @pytest.fixture
 def author(django_user_model):
     return django_user_model.objects.create(username=AUTHOR_USERNAME)
@@ -64,6 +88,21 @@ def eleven_news():
     )
 
 
+@pytest.fixture
+def many_comments(news, author):
+    now = timezone.now()
+    Comment.objects.bulk_create(
+        Comment(
+            news=news,
+            author=author,
+            author_username=author.username,
+            text=f'{COMMENT_TEXT} {index}',
+            created=now + timedelta(minutes=index // 2),
+        )
+        for index in range(settings.COMMENTS_COUNT_ON_DETAIL_PAGE * 2 + 1)
+    )
+
+
 @pytest.fixture
 def home_url():
     return reverse('news:home')
@@ -74,6 +113,11 @@ def detail_url(news):
     return reverse('news:detail', args=(news.id,))
 
 
+@pytest.fixture
+def comments_url(news):
+    return reverse('news:comments', args=(news.id,))
+
+
 @pytest.fixture
 def delete_comment_url(comment):
     return reverse('news:delete', args=(comment.id,))
@@ -0,0 +1,141 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.formats import localize_input
+import pytest
+
+from .constants import NEWS_TEXT, NEWS_TITLE
+from news.admin import COMMENT_PREVIEW_SIZE
+from news.models import Comment
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def news_admin_url(news):
+    return reverse('admin:news_news_change', args=(news.pk,))
+
+
+@pytest.fixture
+def comment_list_url():
+    return reverse('admin:news_comment_changelist')
+
+
+def count_queries(client, url, **params):
+    # Первый запрос заполняет кэш типов содержимого.
+    client.get(url, params)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries.captured_queries), response
+
+
+def test_news_page_shows_bounded_preview(
+    admin_client, news_admin_url, comment, many_comments
+):
+    """
+    Test that the news change page shows only the latest comments with a
+    constant number of queries.
+
+    Arguments:
+        admin_client (django.test.Client): Client logged in as a superuser.
+        news_admin_url (str): URL to the news change page.
+        comment (fixture): Fixture that generates a comment to a news.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    queries, response = count_queries(admin_client, news_admin_url)
+    formset = response.context['inline_admin_formsets'][0].formset
+    latest = Comment.objects.order_by('-created')[:COMMENT_PREVIEW_SIZE]
+    assert [form.instance.pk for form in formset] == [
+        comment.pk for comment in latest
+    ]
+    Comment.objects.exclude(pk=comment.pk).delete()
+    assert count_queries(admin_client, news_admin_url)[0] == queries
+
+
+def test_news_save_keeps_comments(
+    admin_client, news_admin_url, news, many_comments
+):
+    """
+    Test that saving a news with the read-only preview keeps its comments.
+
+    Arguments:
+        admin_client (django.test.Client): Client logged in as a superuser.
+        news_admin_url (str): URL to the news change page.
+        news (fixture): Fixture that generates a news.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    comment_count = Comment.objects.count()
+    # Значение по умолчанию - datetime, из БД читается дата.
+    news.refresh_from_db()
+    formset = admin_client.get(news_admin_url).context[
+        'inline_admin_formsets'
+    ][0].formset
+    data = {
+        'title': f'{NEWS_TITLE} 2',
+        'text': NEWS_TEXT,
+        'date': localize_input(news.date),
+        **{
+            f'{formset.prefix}-{name}': value
+            for name, value in formset.management_form.initial.items()
+        },
+    }
+    for index, form in enumerate(formset):
+        data[f'{formset.prefix}-{index}-id'] = form.instance.pk
+        data[f'{formset.prefix}-{index}-news'] = news.pk
+    response = admin_client.post(news_admin_url, data=data)
+    assert response.status_code == HTTPStatus.FOUND
+    news.refresh_from_db()
+    assert news.title == f'{NEWS_TITLE} 2'
+    assert Comment.objects.count() == comment_count
+
+
+def test_comment_list_is_constant(
+    admin_client, comment_list_url, news, comment, many_comments
+):
+    """
+    Test that the comment list of a news runs the same queries for a
+    short and a long thread and shows the newest comments first.
+
+    Arguments:
+        admin_client (django.test.Client): Client logged in as a superuser.
+        comment_list_url (str): URL to the comment changelist.
+        news (fixture): Fixture that generates a news.
+        comment (fixture): Fixture that generates a comment to a news.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    queries, response = count_queries(
+        admin_client, comment_list_url, news__id__exact=news.pk
+    )
+    dates = [
+        comment.created for comment in response.context['cl'].result_list
+    ]
+    assert dates == sorted(dates, reverse=True)
+    Comment.objects.exclude(pk=comment.pk).delete()
+    assert count_queries(
+        admin_client, comment_list_url, news__id__exact=news.pk
+    )[0] == queries
+
+
+def test_comment_search_by_author(
+    admin_client, comment_list_url, comment, not_author
+):
+    """
+    Test that the search finds comments by the exact author username.
+
+    Arguments:
+        admin_client (django.test.Client): Client logged in as a superuser.
+        comment_list_url (str): URL to the comment changelist.
+        comment (fixture): Fixture that generates a comment to a news.
+        not_author (django.contrib.auth.get_user_model): User model
+            instance, not the comment author.
+    """
+    for user, expected in (
+        (comment.author, [comment]),
+        (not_author, []),
+    ):
+        response = admin_client.get(comment_list_url, {'q': user.username})
+        assert list(response.context['cl'].result_list) == expected
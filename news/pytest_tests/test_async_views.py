@@ -0,0 +1,84 @@
+from asyncio import iscoroutinefunction
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+import pytest
+
+from news.views import (
+    AsyncNewsDetailView, AsyncNewsList, NewsDetailView, NewsList
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def get(rf, view_class, user, url, **kwargs):
+    """Call a view directly, awaiting it if it is asynchronous."""
+    request = rf.get(url)
+    request.user = user
+    view = view_class.as_view()
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, **kwargs)
+    if not response.is_rendered:
+        response.render()
+    return response
+
+
+@pytest.mark.parametrize(
+    'user',
+    (AnonymousUser(), pytest.lazy_fixture('author')),
+)
+@pytest.mark.parametrize(
+    'sync_view, async_view, url_fixture, with_pk',
+    (
+        (NewsList, AsyncNewsList, 'home_url', False),
+        (NewsDetailView, AsyncNewsDetailView, 'detail_url', True),
+    ),
+)
+def test_async_views_match_sync(
+    request, rf, comment, user, sync_view, async_view, url_fixture, with_pk
+):
+    """
+    Test that async read views render the same page as the sync ones.
+
+    Arguments:
+        request (pytest.FixtureRequest): Access to the URL fixtures.
+        rf (django.test.RequestFactory): Request factory.
+        comment (fixture): Fixture that generates a comment to a news.
+        user (User | AnonymousUser): User that requests the page.
+        sync_view (type): Synchronous view class.
+        async_view (type): Asynchronous view class.
+        url_fixture (str): Fixture with the URL of the page.
+        with_pk (bool): Whether the view takes the news pk.
+    """
+    assert iscoroutinefunction(async_view.as_view())
+    url = request.getfixturevalue(url_fixture)
+    kwargs = {'pk': comment.news.pk} if with_pk else {}
+    async_response = get(rf, async_view, user, url, **kwargs)
+    cache.clear()
+    sync_response = get(rf, sync_view, user, url, **kwargs)
+    assert async_response.status_code == sync_response.status_code == 200
+    assert comment.news.title in async_response.content.decode()
+    if not user.is_authenticated:
+        # Страница с формой содержит разные CSRF-токены.
+        assert async_response.content == sync_response.content
+
+
+def test_async_view_uses_anonymous_cache(
+    rf, home_url, news, django_assert_num_queries
+):
+    """
+    Test that the async home page is served from the anonymous cache.
+
+    Arguments:
+        rf (django.test.RequestFactory): Request factory.
+        home_url (str): URL to the home page.
+        news (fixture): Fixture that generates a news.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    first_response = get(rf, AsyncNewsList, AnonymousUser(), home_url)
+    with django_assert_num_queries(0):
+        response = get(rf, AsyncNewsList, AnonymousUser(), home_url)
+    assert response.content == first_response.content
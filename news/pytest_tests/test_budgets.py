@@ -0,0 +1,185 @@
+import os
+from contextlib import contextmanager
+from math import ceil
+from time import perf_counter
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+import pytest
+
+from .budgets import BATCH_BUDGETS, BUDGETS, Budget
+from .constants import COMMENT_TEXT, NEWS_TEXT, NEWS_TITLE
+from news import export
+from news.models import Comment, News
+
+# Объёмы по умолчанию невелики, чтобы набор входил в обычный прогон.
+# Для замеров на реальных объёмах задайте, например,
+# BUDGET_NEWS=10000 BUDGET_COMMENTS=1000000.
+NEWS_VOLUME = int(os.getenv('BUDGET_NEWS', 100))
+COMMENTS_VOLUME = int(os.getenv('BUDGET_COMMENTS', 1000))
+ITERATIONS = int(os.getenv('BUDGET_ITERATIONS', 20))
+BATCH_SIZE = 5000
+
+ROUTES = (
+    ('news:home', None, 'client'),
+    ('news:detail', 'news', 'client'),
+    ('news:comments', 'news', 'client'),
+    ('news:search', None, 'client'),
+    ('news:user_comments', None, 'author_client'),
+    ('news:user_comments_json', None, 'author_client'),
+    ('news:edit', 'comment', 'author_client'),
+    ('news:delete', 'comment', 'author_client'),
+    ('news:export', None, 'admin_client'),
+    ('users:login', None, 'client'),
+    ('users:logout', None, 'client'),
+    ('users:signup', None, 'client'),
+)
+# Параметры запроса для маршрутов, которым без них нечего делать.
+QUERY_STRINGS = {
+    'news:search': urlencode({'q': NEWS_TITLE}),
+}
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def seeded(news, comment, author):
+    """Fill the database; most comments go to the news under test."""
+    News.objects.bulk_create(
+        (
+            News(title=f'{NEWS_TITLE} {index}', text=NEWS_TEXT)
+            for index in range(NEWS_VOLUME)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                news=news,
+                author=author,
+                author_username=author.username,
+                text=f'{COMMENT_TEXT} {index}',
+            )
+            for index in range(COMMENTS_VOLUME)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class CountingCursor:
+    """DB-API cursor proxy that counts the rows fetched through it."""
+
+    def __init__(self, cursor, counter):
+        self.cursor = cursor
+        self.counter = counter
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __iter__(self):
+        for row in self.cursor:
+            self.counter['rows'] += 1
+            yield row
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        if row is not None:
+            self.counter['rows'] += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self.cursor.fetchmany(*args, **kwargs)
+        self.counter['rows'] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self.counter['rows'] += len(rows)
+        return rows
+
+
+@contextmanager
+def count_rows():
+    """
+    Count the rows fetched from the database, whether they become model
+    instances, dicts or tuples.
+    """
+    counter = {'rows': 0}
+
+    def wrapper(execute, sql, params, many, context):
+        cursor = context['cursor']
+        if not isinstance(cursor.cursor, CountingCursor):
+            cursor.cursor = CountingCursor(cursor.cursor, counter)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def get_budget(name):
+    """Budget of a route for the seeded volume of news."""
+    budget = BUDGETS[name]
+    if name not in BATCH_BUDGETS:
+        return budget
+    extra_batches = max(
+        ceil(News.objects.count() / export.BATCH_SIZE) - 1, 0
+    )
+    return Budget(*(
+        None if total is None else total + per_batch * extra_batches
+        for total, per_batch in zip(budget, BATCH_BUDGETS[name])
+    ))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def test_every_route_has_budget():
+    """Test that every named route of the news app has a budget."""
+    names = {
+        f'news:{name}' for name in get_resolver('news.urls').reverse_dict
+        if isinstance(name, str)
+    }
+    assert names <= BUDGETS.keys()
+    assert {name for name, _, _ in ROUTES} == BUDGETS.keys()
+
+
+@pytest.mark.parametrize('name, arg, client_fixture', ROUTES)
+def test_route_budget(request, seeded, name, arg, client_fixture):
+    """
+    Test the number of queries, fetched rows and p95 latency of a route
+    with a cold cache against the checked-in budget.
+
+    Arguments:
+        request (pytest.FixtureRequest): Access to the route fixtures.
+        seeded (fixture): Fixture that fills the database.
+        name (str): Name of the route.
+        arg (str | None): Fixture with the object the route points to.
+        client_fixture (str): Fixture with the client to request with.
+    """
+    budget = get_budget(name)
+    client = request.getfixturevalue(client_fixture)
+    args = (request.getfixturevalue(arg).pk,) if arg else None
+    url = reverse(name, args=args)
+    if name in QUERY_STRINGS:
+        url = f'{url}?{QUERY_STRINGS[name]}'
+    timings = []
+    for _ in range(ITERATIONS):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries, \
+                count_rows() as rows:
+            start = perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            timings.append((perf_counter() - start) * 1000)
+        assert response.status_code < 400
+    assert len(queries) <= budget.queries, queries.captured_queries
+    if budget.rows is not None:
+        assert rows['rows'] <= budget.rows
+    assert percentile(timings, 0.95) <= budget.p95_ms
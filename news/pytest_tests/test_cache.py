@@ -0,0 +1,151 @@
+from django.core.cache import cache
+import pytest
+
+from .constants import COMMENT_TEXT
+from news.cache import VERSION_KEY, get_detail_cache_key
+from news.models import Comment
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(
+    autouse=True,
+    params=(
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.filebased.FileBasedCache',
+    ),
+)
+def cache_backend(request, settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        'default': {'BACKEND': request.param, 'LOCATION': str(tmp_path)},
+    }
+    cache.clear()
+
+
+@pytest.mark.parametrize(
+    'url',
+    (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url')),
+)
+def test_anonymous_response_is_cached(
+    client, url, django_assert_num_queries
+):
+    """
+    Test that a repeated anonymous request is served without queries.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    first_response = client.get(url)
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.content == first_response.content
+
+
+@pytest.mark.parametrize(
+    'url',
+    (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url')),
+)
+def test_comment_changes_invalidate_cache(client, url, news, author):
+    """
+    Test that saving and deleting a comment drops the cached pages.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    empty_content = client.get(url).content
+    comment = Comment.objects.create(
+        news=news, author=author, text=COMMENT_TEXT
+    )
+    assert client.get(url).content != empty_content
+    comment.delete()
+    assert client.get(url).content == empty_content
+
+
+def test_evicted_version_does_not_revive_old_response(
+    client, detail_url, news, author
+):
+    """
+    Test that a response cached under an evicted version is not served
+    again once the version is recreated.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    client.get(detail_url)
+    cache.delete(VERSION_KEY.format(key=get_detail_cache_key(news.pk)))
+    Comment.objects.bulk_create(
+        [Comment(news=news, author=author, text=COMMENT_TEXT)]
+    )
+    assert COMMENT_TEXT in client.get(detail_url).content.decode()
+    cache.delete(VERSION_KEY.format(key=get_detail_cache_key(news.pk)))
+    Comment.objects.all().delete()
+    assert COMMENT_TEXT not in client.get(detail_url).content.decode()
+
+
+def test_news_changes_invalidate_cache(client, home_url, detail_url, news):
+    """
+    Test that saving a news drops both the home and the news pages.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        home_url (str): URL to the home page.
+        detail_url (str): URL to the news detail.
+        news (fixture): Fixture that generates a news.
+    """
+    client.get(home_url)
+    client.get(detail_url)
+    news.title = 'Новый заголовок'
+    news.save()
+    assert news.title in client.get(home_url).content.decode()
+    assert news.title in client.get(detail_url).content.decode()
+
+
+def test_authenticated_response_is_not_cached(author_client, detail_url):
+    """
+    Test that pages rendered for a logged in user are not cached.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+    """
+    author_client.get(detail_url)
+    response = author_client.get(detail_url)
+    assert 'form' in response.context
+
+
+def test_comment_fragment_is_cached(
+    author_client, detail_url, comment, edit_comment_url
+):
+    """
+    Test that a rendered comment is reused until the comment is modified,
+    while the author controls are still rendered live.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+        comment (fixture): Fixture that generates a comment to a news.
+        edit_comment_url (str): URL to the edit comment URL.
+    """
+    new_text = 'Изменённый текст'
+    author_client.get(detail_url)
+    Comment.objects.filter(pk=comment.pk).update(text=new_text)
+    content = author_client.get(detail_url).content.decode()
+    assert COMMENT_TEXT in content
+    assert edit_comment_url in content
+    comment.text = new_text
+    comment.save()
+    content = author_client.get(detail_url).content.decode()
+    assert new_text in content
+    assert COMMENT_TEXT not in content
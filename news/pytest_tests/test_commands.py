@@ -0,0 +1,172 @@
+import csv
+import json
+from datetime import date
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+import pytest
+
+from .constants import COMMENT_TEXT, NEWS_TEXT, NEWS_TITLE
+from news.models import Comment, News
+
+
+pytestmark = pytest.mark.django_db
+
+RECORDS = (
+    {'title': f'{NEWS_TITLE} 1', 'text': NEWS_TEXT, 'date': '2024-01-01'},
+    {'title': f'{NEWS_TITLE} 2', 'text': NEWS_TEXT, 'date': '2024-01-02'},
+    # Дубль первой записи в той же пачке.
+    {'title': f'{NEWS_TITLE} 1', 'text': NEWS_TEXT, 'date': '2024-01-01'},
+    {'title': f'{NEWS_TITLE} 3', 'text': NEWS_TEXT, 'date': 'вчера'},
+    {'title': f'{NEWS_TITLE} 4', 'text': NEWS_TEXT, 'date': ''},
+    {'title': f'{NEWS_TITLE} 5', 'text': None, 'date': '2024-01-05'},
+)
+# Запись, в которой есть только заголовок: в CSV - короткая строка.
+SHORT_RECORD_TITLE = f'{NEWS_TITLE} 6'
+
+
+def write_jsonl(path):
+    path.write_text(
+        '\n'.join(
+            json.dumps(record)
+            for record in (*RECORDS, {'title': SHORT_RECORD_TITLE})
+        ),
+        encoding='utf-8',
+    )
+
+
+def write_csv(path):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=('title', 'text', 'date'))
+        writer.writeheader()
+        writer.writerows(RECORDS)
+        file.write(f'{SHORT_RECORD_TITLE}\r\n')
+
+
+@pytest.mark.parametrize(
+    'filename, write', (('news.jsonl', write_jsonl), ('news.csv', write_csv))
+)
+def test_import_news(tmp_path, filename, write):
+    """
+    Test that news are imported in batches without duplicates and that
+    invalid records are reported and skipped.
+
+    Arguments:
+        tmp_path (pathlib.Path): Temporary directory.
+        filename (str): Name of the input file, defines its format.
+        write (callable): Function that writes the records to the file.
+    """
+    News.objects.create(
+        title=f'{NEWS_TITLE} 2', text=NEWS_TEXT, date=date(2024, 1, 2)
+    )
+    path = tmp_path / filename
+    write(path)
+    stdout, stderr = StringIO(), StringIO()
+    call_command(
+        'import_news', str(path), batch_size=2, stdout=stdout, stderr=stderr
+    )
+    assert set(News.objects.values_list('title', 'date')) == {
+        (f'{NEWS_TITLE} 1', date(2024, 1, 1)),
+        (f'{NEWS_TITLE} 2', date(2024, 1, 2)),
+        (f'{NEWS_TITLE} 4', date.today()),
+    }
+    assert 'Импортировано: 2, дублей: 2, ошибок: 3' in stdout.getvalue()
+    for number in (4, 6, 7):
+        assert f'Запись {number} ' in stderr.getvalue()
+
+
+def test_import_news_skips_malformed_line(tmp_path):
+    """
+    Test that a malformed JSONL line is counted as an error and the lines
+    after it are still imported.
+
+    Arguments:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / 'news.jsonl'
+    path.write_text(
+        '\n'.join((
+            json.dumps(RECORDS[0]), json.dumps(RECORDS[1]),
+            '{broken',
+            json.dumps(RECORDS[4]),
+        )),
+        encoding='utf-8',
+    )
+    stdout, stderr = StringIO(), StringIO()
+    call_command(
+        'import_news', str(path), batch_size=2, stdout=stdout, stderr=stderr
+    )
+    assert News.objects.count() == 3
+    assert 'Импортировано: 3, дублей: 0, ошибок: 1' in stdout.getvalue()
+    assert 'Запись 3' in stderr.getvalue()
+
+
+@pytest.fixture
+def export_data(news, author):
+    """Two news: one with two comments and one without comments."""
+    News.objects.create(title=f'{NEWS_TITLE} 2', text=NEWS_TEXT)
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'{COMMENT_TEXT} {index}')
+        for index in range(2)
+    )
+
+
+def test_export_news_jsonl(tmp_path, export_data):
+    """
+    Test that every news is exported with its comments nested in order.
+
+    Arguments:
+        tmp_path (pathlib.Path): Temporary directory.
+        export_data (fixture): Fixture that generates news and comments.
+    """
+    path = tmp_path / 'news.jsonl'
+    call_command('export_news', output=str(path), batch_size=1)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    exported = [json.loads(line) for line in lines]
+    assert [news['title'] for news in exported] == list(
+        News.objects.order_by('pk').values_list('title', flat=True)
+    )
+    assert [comment['text'] for comment in exported[0]['comments']] == [
+        f'{COMMENT_TEXT} 0', f'{COMMENT_TEXT} 1'
+    ]
+    assert exported[1]['comments'] == []
+
+
+def test_export_news_csv(tmp_path, export_data):
+    """
+    Test that the CSV export lists each news followed by its comments.
+
+    Arguments:
+        tmp_path (pathlib.Path): Temporary directory.
+        export_data (fixture): Fixture that generates news and comments.
+    """
+    path = tmp_path / 'news.csv'
+    call_command('export_news', format='csv', output=str(path))
+    with open(path, encoding='utf-8', newline='') as file:
+        records = [row['record'] for row in csv.DictReader(file)]
+    assert records == ['news', 'comment', 'comment', 'news']
+
+
+@pytest.mark.parametrize(
+    'user_client, status',
+    (
+        (pytest.lazy_fixture('admin_client'), HTTPStatus.OK),
+        (pytest.lazy_fixture('author_client'), HTTPStatus.FORBIDDEN),
+    ),
+)
+def test_export_endpoint(user_client, status, export_data):
+    """
+    Test that only staff can stream the export over HTTP.
+
+    Arguments:
+        user_client (django.test.Client): Client to request the export.
+        status (HTTPStatus): Expected HTTP status code for the response.
+        export_data (fixture): Fixture that generates news and comments.
+    """
+    response = user_client.get(reverse('news:export'), {'format': 'csv'})
+    assert response.status_code == status
+    if status == HTTPStatus.OK:
+        content = b''.join(response.streaming_content).decode()
+        assert content.count('\ncomment,') == 2
@@ -0,0 +1,188 @@
+from http import HTTPStatus
+from time import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.http import http_date
+import pytest
+
+from .constants import COMMENT_TEXT
+from news.models import Comment
+from news.views import AsyncNewsDetailView, AsyncNewsList
+
+
+pytestmark = pytest.mark.django_db
+
+PAGES = (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+
+
+def add_comment(comment):
+    Comment.objects.create(
+        news=comment.news, author=comment.author, text=COMMENT_TEXT
+    )
+
+
+def edit_comment(comment):
+    comment.text = 'Обновлённый комментарий'
+    comment.save()
+
+
+def delete_comment(comment):
+    comment.delete()
+
+
+def edit_news(comment):
+    comment.news.text = 'Обновлённый текст'
+    comment.news.save()
+
+
+@pytest.mark.parametrize('url', PAGES)
+def test_pages_have_validators(client, url, comment):
+    """
+    Test that news pages carry a weak ETag and no Last-Modified header.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'].startswith('W/"')
+    assert 'Last-Modified' not in response
+
+
+@pytest.mark.parametrize('url', PAGES)
+def test_matching_etag_skips_rendering(
+    client, url, comment, django_assert_num_queries
+):
+    """
+    Test that a matching If-None-Match is answered with 304 after a single
+    query and without rendering a template.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        comment (fixture): Fixture that generates a comment to a news.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    etag = client.get(url)['ETag']
+    cache.clear()
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert not response.templates
+    assert not response.content
+
+
+@pytest.mark.parametrize('url', PAGES)
+def test_cached_response_is_revalidated(
+    client, url, comment, django_assert_num_queries
+):
+    """
+    Test that a cached anonymous page is revalidated without queries.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        comment (fixture): Fixture that generates a comment to a news.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    response = client.get(url)
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('change', (edit_news, delete_comment))
+@pytest.mark.parametrize('url', PAGES)
+def test_if_modified_since_does_not_hide_changes(client, url, comment, change):
+    """
+    Test that If-Modified-Since does not answer 304 after a news edit or
+    after the newest comment is deleted.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        url (str): URL of the page to test.
+        comment (fixture): Fixture that generates a comment to a news.
+        change (callable): Change applied to the comment or its news.
+    """
+    content = client.get(url).content
+    change(comment)
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time()))
+    assert response.status_code == HTTPStatus.OK
+    assert response.content != content
+
+
+@pytest.mark.parametrize(
+    'change', (add_comment, edit_comment, delete_comment, edit_news)
+)
+def test_changes_invalidate_etag(client, detail_url, comment, change):
+    """
+    Test that any change visible on the news page changes its ETag.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        comment (fixture): Fixture that generates a comment to a news.
+        change (callable): Change applied to the comment or its news.
+    """
+    etag = client.get(detail_url)['ETag']
+    change(comment)
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize('url', PAGES)
+def test_etag_depends_on_user(client, author_client, url, comment):
+    """
+    Test that a page rendered for a logged in user has its own ETag.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        url (str): URL of the page to test.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    etag = client.get(url)['ETag']
+    response = author_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize(
+    'view_class, url_fixture, with_pk',
+    (
+        (AsyncNewsList, 'home_url', False),
+        (AsyncNewsDetailView, 'detail_url', True),
+    ),
+)
+def test_async_views_answer_not_modified(
+    request, rf, comment, view_class, url_fixture, with_pk
+):
+    """
+    Test that the async read views honour If-None-Match as well.
+
+    Arguments:
+        request (pytest.FixtureRequest): Access to the URL fixtures.
+        rf (django.test.RequestFactory): Request factory.
+        comment (fixture): Fixture that generates a comment to a news.
+        view_class (type): Asynchronous view class.
+        url_fixture (str): Fixture with the URL of the page.
+        with_pk (bool): Whether the view takes the news pk.
+    """
+    url = request.getfixturevalue(url_fixture)
+    kwargs = {'pk': comment.news.pk} if with_pk else {}
+    view = async_to_sync(view_class.as_view())
+    first_request = rf.get(url)
+    first_request.user = AnonymousUser()
+    etag = view(first_request, **kwargs)['ETag']
+    cache.clear()
+    conditional_request = rf.get(url, HTTP_IF_NONE_MATCH=etag)
+    conditional_request.user = AnonymousUser()
+    response = view(conditional_request, **kwargs)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -1,7 +1,11 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
 from django.conf import settings
 import pytest
 
 from news.forms import CommentForm
+from news.models import Comment
 
 
 pytestmark = pytest.mark.django_db
@@ -18,7 +22,7 @@ def test_news_count(client, home_url, eleven_news):
     """
     response = client.get(home_url)
     object_list = response.context['object_list']
-    news_count = object_list.count()
+    news_count = len(object_list)
     assert news_count == settings.NEWS_COUNT_ON_HOME_PAGE
 
 
@@ -33,11 +37,30 @@ def test_news_order(client, home_url, eleven_news):
     """
     response = client.get(home_url)
     object_list = response.context['object_list']
-    all_dates = [news.date for news in object_list]
+    all_dates = [news['date'] for news in object_list]
     sorted_dates = sorted(all_dates, reverse=True)
     assert all_dates == sorted_dates
 
 
+def test_home_comment_count(
+    client, home_url, comment, django_assert_num_queries
+):
+    """
+    Test that the home page gets comment counts with a single query.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        home_url (str): URL to the home page.
+        comment (fixture): Fixture that generates a comment to a news.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    news = response.context['object_list'][0]
+    assert news['comment_count'] == 1
+    assert 'Комментариев: 1' in response.content.decode()
+
+
 def test_comments_order(client, detail_url):
     """
     Test the comments order by date on the news detail URL.
@@ -55,6 +78,114 @@ def test_comments_order(client, detail_url):
     assert all_timestamps == sorted_timestamps
 
 
+def test_comments_keyset_pagination(
+    client, detail_url, comments_url, many_comments
+):
+    """
+    Test that comments are split into bounded pages chained by a cursor.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        comments_url (str): URL to the news comments fragment.
+        many_comments (fixture): Fixture that generates more than two
+            pages of comments with repeated timestamps.
+    """
+    response = client.get(detail_url)
+    pages = [response.context['comments']]
+    next_cursor = response.context['next_cursor']
+    while next_cursor:
+        response = client.get(comments_url, {'cursor': next_cursor})
+        pages.append(response.context['comments'])
+        next_cursor = response.context['next_cursor']
+    assert [len(page) for page in pages] == [
+        settings.COMMENTS_COUNT_ON_DETAIL_PAGE,
+        settings.COMMENTS_COUNT_ON_DETAIL_PAGE,
+        1,
+    ]
+    keys = [
+        (comment.created, comment.pk) for page in pages for comment in page
+    ]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == Comment.objects.count()
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    (
+        'not-a-cursor',
+        urlsafe_b64encode(b'2024-01-01T00:00:00+00:00|' + b'9' * 30).decode(),
+        urlsafe_b64encode(b'9999-12-31T23:00:00-05:00|5').decode(),
+        urlsafe_b64encode(b'2024-01-01T00:00:00|5').decode(),
+    ),
+)
+def test_comments_invalid_cursor(client, comments_url, cursor):
+    """
+    Test that a malformed cursor, a naive timestamp or an out of range
+    timestamp or pk is rejected with a bad request status.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        comments_url (str): URL to the news comments fragment.
+        cursor (str): Invalid cursor.
+    """
+    response = client.get(comments_url, {'cursor': cursor})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_comments_rendered_without_users(
+    client, detail_url, comment, django_assert_num_queries
+):
+    """
+    Test that comments are rendered with the author name stored in the
+    comment, without querying users.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        comment (fixture): Fixture that generates a comment to a news.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    with django_assert_num_queries(2) as queries:
+        response = client.get(detail_url)
+    assert not any('auth_user' in query['sql'] for query in queries)
+    assert comment.author.username in response.content.decode()
+
+
+def test_author_rename_updates_comments(client, detail_url, comment):
+    """
+    Test that renaming a user updates the name shown in their comments.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    client.get(detail_url)
+    author = comment.author
+    author.username = 'Новое имя'
+    author.save()
+    comment.refresh_from_db()
+    assert comment.author_username == author.username
+    assert author.username in client.get(detail_url).content.decode()
+
+
+def test_author_change_updates_name(comment, not_author):
+    """
+    Test that moving a comment to another author shows the new name.
+
+    Arguments:
+        comment (fixture): Fixture that generates a comment to a news.
+        not_author (django.contrib.auth.get_user_model): User model
+            instance, the new author.
+    """
+    comment = Comment.objects.get(pk=comment.pk)
+    comment.author = not_author
+    comment.save()
+    comment.refresh_from_db()
+    assert comment.author_username == not_author.username
+
+
 def test_anonymous_client_has_no_form(client, detail_url):
     """
     Test that anonymous client has no comment form at the news detail URL.
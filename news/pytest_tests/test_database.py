@@ -0,0 +1,53 @@
+from django.db import connection
+import pytest
+
+from yanews.sqlite3.base import DatabaseWrapper
+
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='SQLite specific settings'
+)
+
+
+@pytest.fixture
+def file_connection(tmp_path, django_db_blocker):
+    """Connection configured like the default one, but to a file."""
+    settings_dict = {
+        **connection.settings_dict, 'NAME': tmp_path / 'db.sqlite3'
+    }
+    wrapper = DatabaseWrapper(settings_dict, alias='pragmas')
+    with django_db_blocker.unblock():
+        yield wrapper
+        wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize(
+    'name, value',
+    (
+        ('journal_mode', 'wal'),
+        ('synchronous', 1),
+        ('cache_size', -64 * 1024),
+        ('temp_store', 2),
+    ),
+)
+def test_pragmas_applied_on_connect(file_connection, name, value):
+    """
+    Test that PRAGMAS from the settings are set for every new connection.
+
+    Arguments:
+        file_connection (DatabaseWrapper): Connection to a file database.
+        name (str): Name of the pragma.
+        value (str | int): Expected pragma value.
+    """
+    assert pragma(file_connection, name) == value
+
+
+def test_connections_are_persistent():
+    """Test that connections are reused between requests."""
+    assert connection.settings_dict['CONN_MAX_AGE'] > 0
@@ -0,0 +1,50 @@
+from django.db import connection
+import pytest
+
+from news.models import Comment, News
+from news.snapshot import annotate_comment_stats, get_home_queryset
+
+
+pytestmark = pytest.mark.django_db
+
+
+def explain(queryset):
+    """Return the SQLite query plan for a queryset as a single string."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is SQLite only'
+)
+@pytest.mark.parametrize(
+    'queryset, index',
+    (
+        (get_home_queryset(), 'news_date_idx'),
+        (
+            Comment.objects.filter(news_id=1).order_by('created', 'pk'),
+            'comment_news_created_idx',
+        ),
+        (
+            annotate_comment_stats(News.objects.filter(pk=1)),
+            'comment_news_modified_idx',
+        ),
+        (
+            Comment.objects.filter(author_id=1),
+            'comment_author_created_idx',
+        ),
+    ),
+)
+def test_hot_queries_use_indexes(queryset, index):
+    """
+    Test that the hot queries are served by indexes without a sort step.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Query to explain.
+        index (str): Name of the index the query must use.
+    """
+    plan = explain(queryset)
+    assert index in plan
+    assert 'TEMP B-TREE' not in plan
@@ -70,6 +70,22 @@ def test_user_cant_use_bad_words(not_author_client, detail_url):
     assert comments_count == 0
 
 
+def test_invalid_comment_keeps_thread(not_author_client, detail_url, comment):
+    """
+    Test that the page re-rendered for an invalid comment still shows
+    the existing comments.
+
+    Arguments:
+        not_author_client (django.test.Client): Django client instance.
+            Represents a non-author comment client.
+        detail_url (str): URL to the news detail.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    bad_words_data = {'text': BAD_WORDS[0]}
+    response = not_author_client.post(detail_url, data=bad_words_data)
+    assert list(response.context['comments']) == [comment]
+
+
 def test_author_can_delete_comment(
     author_client, delete_comment_url
 ):
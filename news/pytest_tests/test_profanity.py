@@ -0,0 +1,58 @@
+import pytest
+
+from news.forms import BAD_WORDS, CommentForm
+from news.profanity import RegexFilter, get_profanity_filter
+
+
+@pytest.fixture
+def profanity_filter():
+    return RegexFilter(('редиска', 'негодяй', 'ёжик', 'ёжик в тумане'))
+
+
+@pytest.mark.parametrize(
+    'text, word',
+    (
+        ('Ты редиска!', 'редиска'),
+        ('НЕГОДЯЙ, одним словом', 'негодяй'),
+        ('Ежик в тумане', 'ежик в тумане'),
+        ('pедиска с латинской р', 'редиска'),
+        ('редисками не ругаются', None),
+        ('Обычный комментарий', None),
+    ),
+)
+def test_filter_finds_words(profanity_filter, text, word):
+    """
+    Test that whole words are found after case and letter normalization.
+
+    Arguments:
+        profanity_filter (RegexFilter): Filter built from a sample list.
+        text (str): Comment text to check.
+        word (str | None): Expected matched term.
+    """
+    assert profanity_filter.find(text) == word
+
+
+def test_empty_filter_finds_nothing():
+    """Test that a filter without words accepts any text."""
+    assert RegexFilter(()).find(BAD_WORDS[0]) is None
+
+
+def test_words_file_extends_filter(settings, tmp_path):
+    """
+    Test that words from BAD_WORDS_FILE are rejected by the comment form
+    and that the matched term is reported.
+
+    Arguments:
+        settings (fixture): pytest-django settings override.
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# словарь модератора\nзлодей\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = words_file
+    get_profanity_filter.cache_clear()
+    try:
+        form = CommentForm(data={'text': 'Какой-то злодей'})
+        assert not form.is_valid()
+        assert form.errors.as_data()['text'][0].params == {'word': 'злодей'}
+    finally:
+        get_profanity_filter.cache_clear()
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+from django.urls import reverse
+import pytest
+
+from yanews import profiling
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profiling_url():
+    return reverse('profiling')
+
+
+@pytest.fixture
+def profiling_enabled(settings):
+    settings.PROFILING_ENABLED = True
+    profiling.reset_stats()
+    yield
+    profiling.reset_stats()
+
+
+def test_profiling_collects_stats(
+    profiling_enabled, client, admin_client, detail_url, profiling_url
+):
+    """
+    Test that an enabled profiler sets Server-Timing and aggregates
+    the request under its URL name.
+
+    Arguments:
+        profiling_enabled (fixture): Fixture that enables the profiler.
+        client (django.test.Client): Django test client instance.
+        admin_client (django.test.Client): Client logged in as a superuser.
+        detail_url (str): URL to the news detail.
+        profiling_url (str): URL to the profiling stats.
+    """
+    response = client.get(detail_url)
+    assert 'sql;dur=' in response['Server-Timing']
+    assert 'template;dur=' in response['Server-Timing']
+    stats = admin_client.get(profiling_url).json()
+    detail_stats = stats['news:detail']
+    assert detail_stats['requests'] == 1
+    assert detail_stats['avg_sql_queries'] >= 1
+    assert detail_stats['avg_template_ms'] > 0
+    assert detail_stats['avg_response_bytes'] == len(response.content)
+
+
+def test_profiling_disabled(client, admin_client, detail_url, profiling_url):
+    """
+    Test that the profiler adds nothing when it is disabled.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        admin_client (django.test.Client): Client logged in as a superuser.
+        detail_url (str): URL to the news detail.
+        profiling_url (str): URL to the profiling stats.
+    """
+    response = client.get(detail_url)
+    assert not response.has_header('Server-Timing')
+    response = admin_client.get(profiling_url)
+    assert response.status_code == HTTPStatus.NOT_FOUND
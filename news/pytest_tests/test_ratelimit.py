@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+import pytest
+
+from .constants import FORM_COMMENT_TEXT
+from news.models import Comment
+from news.ratelimit import check_rate
+
+
+LIMITS = {'user': (3, 60)}
+NOW = 6000
+
+
+def hit(now, ident=1):
+    return check_rate('test', {'user': ident}, LIMITS, now=now)
+
+
+def test_requests_over_limit_are_rejected():
+    """Test that the request over the limit is rejected until it expires."""
+    for second in range(3):
+        assert hit(NOW + second) is None
+    retry_after = hit(NOW + 3)
+    assert retry_after is not None
+    assert hit(NOW + 3, ident=2) is None
+    assert hit(NOW + 3 + retry_after - 1) is not None
+    assert hit(NOW + 3 + retry_after) is None
+
+
+def test_previous_window_is_weighted():
+    """
+    Test that requests from the previous window count in proportion to
+    its overlap with the sliding window.
+    """
+    for _ in range(3):
+        assert hit(NOW + 50) is None
+    # Прошло 20 секунд окна: доля предыдущего - 2/3, то есть 2 запроса.
+    assert hit(NOW + 80) is None
+    assert hit(NOW + 80) is not None
+
+
+def test_rejected_requests_are_not_counted():
+    """Test that retries during the block do not extend it."""
+    for _ in range(3):
+        hit(NOW)
+    retry_after = hit(NOW)
+    for second in range(retry_after):
+        hit(NOW + second)
+    assert hit(NOW + retry_after) is None
+
+
+def test_counters_survive_full_response_cache():
+    """
+    Test that filling the response cache does not evict the counters,
+    which would let a client bypass the limit.
+    """
+    for _ in range(3):
+        hit(NOW)
+    cache.set_many({f'news:detail:{pk}': pk for pk in range(1000)})
+    assert hit(NOW) is not None
+
+
+@pytest.fixture
+def comment_limits(settings):
+    settings.RATE_LIMITS = {
+        'comments': {'user': (2, 60), 'ip': (3, 60)},
+    }
+
+
+@pytest.mark.django_db
+def test_comment_writes_share_user_limit(
+    comment_limits, author_client, detail_url, edit_comment_url,
+    delete_comment_url, comment
+):
+    """
+    Test that creating, editing and deleting comments share one limit
+    and that the rejected request gets 429 with Retry-After.
+
+    Arguments:
+        comment_limits (fixture): Small limits for the comment writes.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+        edit_comment_url (str): URL to edit the comment.
+        delete_comment_url (str): URL to delete the comment.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    form_data = {'text': FORM_COMMENT_TEXT}
+    author_client.post(detail_url, data=form_data)
+    author_client.post(edit_comment_url, data=form_data)
+    response = author_client.post(delete_comment_url)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response['Retry-After']) > 0
+    assert Comment.objects.filter(pk=comment.pk).exists()
+    assert author_client.get(edit_comment_url).status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_comment_writes_share_ip_limit(
+    comment_limits, author_client, not_author_client, detail_url
+):
+    """
+    Test that users behind one IP address share the per-IP limit.
+
+    Arguments:
+        comment_limits (fixture): Small limits for the comment writes.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        not_author_client (django.test.Client): Django client instance.
+            Represents a non-author comment client.
+        detail_url (str): URL to the news detail.
+    """
+    form_data = {'text': FORM_COMMENT_TEXT}
+    for client in (author_client, author_client, not_author_client):
+        client.post(detail_url, data=form_data)
+    response = not_author_client.post(detail_url, data=form_data)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert Comment.objects.count() == 3
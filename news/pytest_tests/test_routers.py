@@ -0,0 +1,111 @@
+import sqlite3
+
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory
+import pytest
+
+from .constants import FORM_COMMENT_TEXT, NEWS_TITLE
+from news.management.commands.replicate_db import replicate
+from news.models import News
+from yanews.routers import PRIMARY_COOKIE, ReplicaMiddleware, read_primary
+
+REPLICA = 'replica0'
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.REPLICA_DATABASES = [REPLICA]
+
+
+def route(request, write=False, pin=False):
+    """Run a view behind the middleware; the response holds the read DB."""
+    def view(request):
+        if pin:
+            read_primary()
+        database = router.db_for_read(News)
+        if write:
+            router.db_for_write(News)
+        return HttpResponse(database)
+
+    return ReplicaMiddleware(view)(request)
+
+
+def test_safe_request_reads_replica(replicas):
+    """Test that a GET reads the replica and does not pin the user."""
+    response = route(RequestFactory().get('/'))
+    assert response.content.decode() == REPLICA
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+def test_write_pins_user_to_primary(replicas):
+    """
+    Test that a POST reads the primary and that a write makes the next
+    requests of the user read it too.
+    """
+    response = route(RequestFactory().post('/'), write=True)
+    assert response.content.decode() == DEFAULT_DB_ALIAS
+    request = RequestFactory().get('/')
+    request.COOKIES = {PRIMARY_COOKIE: response.cookies[PRIMARY_COOKIE].value}
+    assert route(request).content.decode() == DEFAULT_DB_ALIAS
+
+
+def test_read_primary_pins_request(replicas):
+    """Test that read_primary switches the rest of the request."""
+    response = route(RequestFactory().get('/'), pin=True)
+    assert response.content.decode() == DEFAULT_DB_ALIAS
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+def test_reads_outside_requests_use_primary(replicas):
+    """Test that commands and background threads read the primary."""
+    assert router.db_for_read(News) == DEFAULT_DB_ALIAS
+
+
+@pytest.mark.django_db
+def test_comment_sets_primary_cookie(
+    settings, author_client, client, detail_url, home_url
+):
+    """
+    Test that posting a comment pins the author, and reading does not.
+
+    Arguments:
+        settings (fixture): Django settings.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+        home_url (str): URL to the home page.
+    """
+    # В тестах реплика - зеркало основной базы.
+    settings.REPLICA_DATABASES = [DEFAULT_DB_ALIAS]
+    assert PRIMARY_COOKIE not in client.get(home_url).cookies
+    response = author_client.post(detail_url, data={'text': FORM_COMMENT_TEXT})
+    assert PRIMARY_COOKIE in response.cookies
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replicate_copies_database(tmp_path):
+    """
+    Test that the replica file gets the primary data.
+
+    Arguments:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    News.objects.create(title=NEWS_TITLE, text=NEWS_TITLE)
+    path = tmp_path / 'replica.sqlite3'
+    connection.ensure_connection()
+    replicate(connection.connection, path)
+    replica = sqlite3.connect(path)
+    try:
+        titles = replica.execute('SELECT title FROM news_news').fetchall()
+    finally:
+        replica.close()
+    assert titles == [(NEWS_TITLE,)]
+
+
+def test_replicate_db_requires_replicas():
+    """Test that the command explains how to configure the replicas."""
+    with pytest.raises(CommandError):
+        call_command('replicate_db')
@@ -16,6 +16,7 @@ edit_delete_comment_url = [
     (
         pytest.lazy_fixture('home_url'),
         pytest.lazy_fixture('detail_url'),
+        pytest.lazy_fixture('comments_url'),
         pytest.lazy_fixture('login_url'),
         pytest.lazy_fixture('logout_url'),
         pytest.lazy_fixture('signup_url'),
@@ -0,0 +1,198 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.urls import reverse
+import pytest
+
+from news.models import News
+from news.search import search as search_news
+
+
+pytestmark = pytest.mark.django_db
+
+SEARCH_URL = reverse('news:search')
+
+
+def search(client, query, **params):
+    """Return the news found by the search page, in rank order."""
+    response = client.get(SEARCH_URL, {'q': query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+def titles(response):
+    return [news.title for news in response.context['results']]
+
+
+def test_search_matches_word_forms(client):
+    """
+    Test that a query finds news with other forms of the same words.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    News.objects.create(
+        title='Совещание', text='Губернатор провёл совещание с министрами.'
+    )
+    News.objects.create(title='Погода', text='Завтра ожидается дождь.')
+    assert titles(search(client, 'губернаторами министра')) == ['Совещание']
+    assert titles(search(client, 'провел')) == ['Совещание']
+
+
+def test_stop_words_are_not_indexed(client):
+    """
+    Test that function words neither match nor restrict the search.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    News.objects.create(title='Погода', text='Завтра и послезавтра дождь.')
+    assert titles(search(client, 'и')) == []
+    assert titles(search(client, 'дождь и снег')) == []
+    assert titles(search(client, 'дождь и')) == ['Погода']
+
+
+def test_title_matches_rank_first(client):
+    """
+    Test that news with the words in the title rank above the others.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    News.objects.create(title='Выборы', text='Итоги голосования в регионах.')
+    News.objects.create(title='Голосование', text='Подсчёт голосов завершён.')
+    assert titles(search(client, 'голосование')) == [
+        'Голосование', 'Выборы'
+    ]
+
+
+def test_snippet_highlights_found_words(client):
+    """
+    Test that the snippet marks the found words and escapes the text.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    News.objects.create(
+        title='Новость', text='<b>Жирный</b> текст о выборах губернатора.'
+    )
+    content = search(client, 'выборы').content.decode()
+    assert '<mark>выборах</mark>' in content
+    assert '&lt;b&gt;Жирный&lt;/b&gt;' in content
+
+
+def test_index_follows_changes(client):
+    """
+    Test that edited, deleted and bulk created news are reindexed.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    news = News.objects.create(title='Старый заголовок', text='Текст')
+    news.title = 'Новый заголовок'
+    news.save()
+    assert titles(search(client, 'старый')) == []
+    assert titles(search(client, 'новый')) == ['Новый заголовок']
+    news.delete()
+    assert titles(search(client, 'новый')) == []
+    News.objects.bulk_create([News(title='Импорт', text='Из файла')])
+    assert titles(search(client, 'импорт')) == ['Импорт']
+
+
+def test_search_pages(client, settings):
+    """
+    Test that results are split into pages.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        settings (pytest_django.fixtures.SettingsWrapper): Django settings.
+    """
+    settings.SEARCH_RESULTS_PER_PAGE = 2
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст') for index in range(3)
+    )
+    first_page = search(client, 'новость')
+    assert len(first_page.context['results']) == 2
+    assert first_page.context['has_next']
+    last_page = search(client, 'новость', page=2)
+    assert len(last_page.context['results']) == 1
+    assert not last_page.context['has_next']
+
+
+@pytest.mark.parametrize(
+    'query', ('', '   ', '"', 'NEAR(', 'title:*', 'AND OR NOT', '-')
+)
+def test_query_syntax_is_not_interpreted(client, news, query):
+    """
+    Test that FTS5 operators in the query neither fail nor match anything.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        news (fixture): Fixture that generates a news.
+        query (str): Query typed by the user.
+    """
+    assert titles(search(client, query)) == []
+
+
+def test_empty_query_does_not_hit_database(
+    client, django_assert_num_queries
+):
+    """
+    Test that an empty query does not touch the database.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        django_assert_num_queries (fixture): Query count assertion helper.
+    """
+    with django_assert_num_queries(0):
+        search(client, '')
+
+
+@pytest.mark.parametrize(
+    'page',
+    (
+        '0', '-1', 'x', '100000000000000000000',
+        str(
+            settings.SEARCH_MAX_CANDIDATES
+            // settings.SEARCH_RESULTS_PER_PAGE + 2
+        ),
+    ),
+)
+def test_invalid_page_is_bad_request(client, page):
+    """
+    Test that an invalid page number or one past the ranked matches is
+    rejected.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        page (str): Page number from the query string.
+    """
+    response = client.get(SEARCH_URL, {'q': 'новость', 'page': page})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_last_ranked_page_is_allowed(client):
+    """
+    Test that the last page that can hold ranked matches is accepted.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+    """
+    page = (
+        settings.SEARCH_MAX_CANDIDATES // settings.SEARCH_RESULTS_PER_PAGE
+        + 1
+    )
+    response = client.get(SEARCH_URL, {'q': 'новость', 'page': page})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_only_latest_matches_are_ranked():
+    """Test that ranking is limited to the most recently added matches."""
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст') for index in range(3)
+    )
+    results, has_next = search_news('новость', 1, 10, candidates=2)
+    assert sorted(news.title for news in results) == [
+        'Новость 1', 'Новость 2'
+    ]
+    assert not has_next
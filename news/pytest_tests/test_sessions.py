@@ -0,0 +1,47 @@
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=('cached_db', 'signed_cookies'))
+def session_client(request, settings, author):
+    settings.SESSION_ENGINE = settings.SESSION_ENGINES[request.param]
+    client = Client()
+    client.force_login(author)
+    return client
+
+
+def test_session_read_without_database(session_client, author, home_url):
+    """
+    Test that an authenticated request does not read the session table.
+
+    Arguments:
+        session_client (django.test.Client): Client logged in with the
+            session engine under test.
+        author (django.contrib.auth.get_user_model): Logged in user.
+        home_url (str): URL to the home page.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = session_client.get(home_url)
+    assert response.context['user'] == author
+    assert not any(
+        'django_session' in query['sql'] for query in queries
+    )
+
+
+def test_unchanged_session_is_not_saved(settings, session_client, home_url):
+    """
+    Test that a read request does not write the session back.
+
+    Arguments:
+        settings (fixture): pytest-django settings override.
+        session_client (django.test.Client): Client logged in with the
+            session engine under test.
+        home_url (str): URL to the home page.
+    """
+    response = session_client.get(home_url)
+    assert settings.SESSION_COOKIE_NAME not in response.cookies
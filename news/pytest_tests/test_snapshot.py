@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from .constants import COMMENT_TEXT, NEWS_TITLE
+from news.cache import get_version
+from news.models import Comment, News
+from news.snapshot import (
+    HOME_SNAPSHOT_KEY, SUMMARY_WORDS, get_home_snapshot
+)
+
+
+pytestmark = pytest.mark.django_db
+
+LONG_TEXT = ' '.join(f'слово{index}' for index in range(SUMMARY_WORDS * 2))
+
+
+@pytest.fixture
+def oldest_news(eleven_news):
+    """The news that does not fit on the home page."""
+    return News.objects.order_by('date').first()
+
+
+def test_home_is_served_from_snapshot(
+    author_client, home_url, news
+):
+    """
+    Test that the home page reads no database once the snapshot is built.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        home_url (str): URL to the home page.
+        news (fixture): Fixture that generates a news.
+    """
+    get_home_snapshot()
+    # Сессия и пользователь авторизованного клиента читаются из БД.
+    with CaptureQueriesContext(connection) as queries:
+        author_client.get(home_url)
+    assert not any(
+        'news_news' in query['sql'] for query in queries.captured_queries
+    )
+
+
+def test_summary_matches_truncatewords():
+    """Test that the snapshot keeps the text as the template cut it."""
+    News.objects.create(title=NEWS_TITLE, text=LONG_TEXT)
+    summary = get_home_snapshot()[0]['summary']
+    assert summary == truncatewords(LONG_TEXT, SUMMARY_WORDS)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_updates_one_row(news, author):
+    """
+    Test that a comment to a news on the home page rereads only its row.
+
+    Arguments:
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    News.objects.create(
+        title=NEWS_TITLE, text=NEWS_TITLE,
+        date=datetime.today() - timedelta(days=1),
+    )
+    snapshot = get_home_snapshot()
+    assert snapshot[0]['id'] == news.pk
+    # Без транзакции снимок сохраняется сразу после записи.
+    with CaptureQueriesContext(connection) as queries:
+        Comment.objects.create(news=news, author=author, text=COMMENT_TEXT)
+    selects = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+    assert len(selects) == 1
+    assert f'"news_news"."id" = {news.pk}' in selects[0]['sql']
+    with CaptureQueriesContext(connection) as queries:
+        updated = get_home_snapshot()
+    assert not queries.captured_queries
+    assert updated[0]['comment_count'] == 1
+    assert updated[1:] == snapshot[1:]
+
+
+def test_comment_off_home_keeps_snapshot(oldest_news, author):
+    """
+    Test that a comment to a news off the home page keeps the snapshot.
+
+    Arguments:
+        oldest_news (fixture): The news that does not fit on the home page.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    get_home_snapshot()
+    version = get_version(HOME_SNAPSHOT_KEY)
+    Comment.objects.create(news=oldest_news, author=author, text=COMMENT_TEXT)
+    assert get_version(HOME_SNAPSHOT_KEY) == version
+
+
+def test_new_news_rebuilds_snapshot(
+    eleven_news, django_capture_on_commit_callbacks
+):
+    """
+    Test that a new news gets on the home page and pushes the oldest off.
+
+    Arguments:
+        eleven_news (fixture): Fixture that generate eleven news.
+        django_capture_on_commit_callbacks (fixture): Runs the callbacks
+            registered for the transaction commit.
+    """
+    snapshot = get_home_snapshot()
+    with django_capture_on_commit_callbacks(execute=True):
+        news = News.objects.create(
+            title=NEWS_TITLE, text=NEWS_TITLE,
+            date=datetime.today() + timedelta(days=1),
+        )
+    with CaptureQueriesContext(connection) as queries:
+        updated = get_home_snapshot()
+    assert not queries.captured_queries
+    assert len(updated) == settings.NEWS_COUNT_ON_HOME_PAGE
+    assert updated[0]['id'] == news.pk
+    assert updated[1:] == snapshot[:-1]
+
+
+def test_stale_build_is_not_read(news, author):
+    """
+    Test that a change without a committed rebuild is not hidden by the
+    old snapshot.
+
+    Arguments:
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    get_home_snapshot()
+    # Тест идёт в транзакции, поэтому новый снимок не сохраняется, а
+    # старый остаётся под прежней версией.
+    Comment.objects.create(news=news, author=author, text=COMMENT_TEXT)
+    assert get_home_snapshot()[0]['comment_count'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_news_delete_rebuilds_once(news, many_comments):
+    """
+    Test that deleting a news with many comments rebuilds the snapshot
+    once, not once per cascaded comment.
+
+    Arguments:
+        news (fixture): Fixture that generates a news.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    get_home_snapshot()
+    with CaptureQueriesContext(connection) as queries:
+        news.delete()
+    snapshot_builds = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT "news_news"')
+    ]
+    assert len(snapshot_builds) == 1
+    # Комментарии, BEGIN, удаление комментариев, новости и снимок.
+    assert len(queries) <= 6
+    assert get_home_snapshot() == []
@@ -0,0 +1,80 @@
+from functools import partial
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connections
+import pytest
+
+from news.management.commands.profile_startup import (
+    group_by_package, parse_import_time
+)
+from yanews.warmup import STEPS, warm_database, warm_up
+
+IMPORT_TIME = """\
+import time: self [us] | cumulative | imported package
+import time:       150 |        150 |     django.utils
+import time:        50 |        200 |   django
+import time:       300 |        300 | news.views
+"""
+
+
+def test_parse_import_time():
+    """Test that own import times are read and summed per package."""
+    modules = parse_import_time(IMPORT_TIME.splitlines())
+    assert modules == {'django.utils': 150, 'django': 50, 'news.views': 300}
+    assert group_by_package(modules) == {'django': 200, 'news': 300}
+
+
+@pytest.fixture
+def opened_connections(monkeypatch):
+    """Aliases of the databases connected to, without connecting."""
+    opened = []
+    for alias in connections:
+        monkeypatch.setattr(
+            connections[alias], 'ensure_connection',
+            partial(opened.append, alias),
+        )
+    return opened
+
+
+def test_warm_up_leaves_connections_closed(opened_connections):
+    """
+    Test that the warm-up runs every step and does not open database
+    connections, which forked workers would share.
+
+    Arguments:
+        opened_connections (list): Aliases of the connected databases.
+    """
+    timings = warm_up()
+    assert list(timings) == [name for name, _ in STEPS]
+    assert not opened_connections
+
+
+def test_warm_database_opens_connections(opened_connections):
+    """
+    Test that the worker hook connects to every database.
+
+    Arguments:
+        opened_connections (list): Aliases of the connected databases.
+    """
+    warm_database()
+    assert opened_connections == list(connections)
+
+
+def test_profile_startup_reports_first_request(monkeypatch, tmp_path):
+    """
+    Test that the command measures a fresh process with and without
+    the warm-up.
+
+    Arguments:
+        monkeypatch (fixture): Pytest fixture to patch the environment.
+        tmp_path (pathlib.Path): Temporary directory for the database and
+            sessions of the measured process.
+    """
+    monkeypatch.setenv('YANEWS_DATABASE', str(tmp_path / 'db.sqlite3'))
+    monkeypatch.setenv('YANEWS_SESSION_CACHE_DIR', str(tmp_path / 'sessions'))
+    output = StringIO()
+    call_command('profile_startup', top=3, stdout=output)
+    output = output.getvalue()
+    assert 'с прогревом' in output
+    assert '200 OK' in output
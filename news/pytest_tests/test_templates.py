@@ -0,0 +1,87 @@
+from importlib import import_module
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+import pytest
+
+
+@pytest.fixture
+def template_dir(settings, tmp_path):
+    """Project templates plus a temporary directory."""
+    settings.TEMPLATES = [{
+        **settings.TEMPLATES[0],
+        'DIRS': [*settings.TEMPLATES[0]['DIRS'], tmp_path],
+    }]
+    return tmp_path
+
+
+def test_compile_templates_passes():
+    """Test that every template of the project and its apps parses."""
+    call_command('compile_templates', verbosity=0)
+
+
+@pytest.mark.parametrize(
+    'source',
+    (
+        '{% if %}',
+        '{% load missing_tags %}',
+        '{% extends "missing.html" %}',
+        '{% include "missing.html" %}',
+    ),
+)
+def test_compile_templates_fails(template_dir, source):
+    """
+    Test that a broken template or a missing constant reference fails
+    the build.
+
+    Arguments:
+        template_dir (pathlib.Path): Extra template directory.
+        source (str): Template source.
+    """
+    (template_dir / 'broken.html').write_text(source, encoding='utf-8')
+    with pytest.raises(CommandError, match='broken.html'):
+        call_command('compile_templates', verbosity=0)
+
+
+@pytest.fixture
+def import_production(monkeypatch):
+    """Import the production settings anew with the current environment."""
+    def import_production():
+        monkeypatch.delitem(
+            sys.modules, 'yanews.settings_production', raising=False
+        )
+        return import_module('yanews.settings_production')
+    return import_production
+
+
+def test_production_settings_cache_templates(monkeypatch, import_production):
+    """
+    Test that production settings turn DEBUG off, take the secret key from
+    the environment and cache templates.
+
+    Arguments:
+        monkeypatch (fixture): Pytest fixture to patch the environment.
+        import_production (fixture): Imports the production settings.
+    """
+    monkeypatch.setenv('YANEWS_SECRET_KEY', 'production-key')
+    production = import_production()
+    assert production.DEBUG is False
+    assert production.SECRET_KEY == 'production-key'
+    loaders = production.TEMPLATES[0]['OPTIONS']['loaders']
+    assert loaders[0][0] == 'django.template.loaders.cached.Loader'
+
+
+def test_production_settings_require_secret_key(
+    monkeypatch, import_production
+):
+    """
+    Test that production settings refuse to load without a secret key.
+
+    Arguments:
+        monkeypatch (fixture): Pytest fixture to patch the environment.
+        import_production (fixture): Imports the production settings.
+    """
+    monkeypatch.delenv('YANEWS_SECRET_KEY', raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        import_production()
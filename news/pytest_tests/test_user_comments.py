@@ -0,0 +1,159 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from .constants import COMMENT_TEXT, NEWS_TITLE
+from news.models import Comment
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user_comments_url():
+    return reverse('news:user_comments')
+
+
+@pytest.fixture
+def user_comments_json_url():
+    return reverse('news:user_comments_json')
+
+
+def test_pages_cover_all_comments_newest_first(
+    author_client, user_comments_json_url, many_comments
+):
+    """
+    Test that the pages list every comment of the user exactly once,
+    newest first, including comments created at the same moment.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        user_comments_json_url (str): URL to the user comments JSON.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    ids = []
+    cursor = None
+    while True:
+        params = {'cursor': cursor} if cursor else {}
+        data = author_client.get(user_comments_json_url, params).json()
+        ids += [comment['id'] for comment in data['comments']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            break
+    assert ids == list(
+        Comment.objects.order_by('-created', '-pk').values_list(
+            'pk', flat=True
+        )
+    )
+
+
+def test_only_own_comments(
+    not_author_client, user_comments_url, comment
+):
+    """
+    Test that another user does not see the author's comments.
+
+    Arguments:
+        not_author_client (django.test.Client): Django client instance.
+            Represents a non-author comment client.
+        user_comments_url (str): URL to the user comments page.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    response = not_author_client.get(user_comments_url)
+    assert not response.context['comments']
+    assert COMMENT_TEXT not in response.content.decode()
+
+
+def test_anonymous_user(client, user_comments_url, user_comments_json_url):
+    """
+    Test that the page redirects an anonymous user to the login page and
+    the JSON endpoint refuses.
+
+    Arguments:
+        client (django.test.Client): Django test client instance.
+        user_comments_url (str): URL to the user comments page.
+        user_comments_json_url (str): URL to the user comments JSON.
+    """
+    assert client.get(user_comments_url).status_code == HTTPStatus.FOUND
+    assert (
+        client.get(user_comments_json_url).status_code
+        == HTTPStatus.FORBIDDEN
+    )
+
+
+@pytest.mark.parametrize(
+    'url',
+    (
+        pytest.lazy_fixture('user_comments_url'),
+        pytest.lazy_fixture('user_comments_json_url'),
+    ),
+)
+def test_out_of_range_cursor(author_client, url):
+    """
+    Test that a cursor with a pk too large for the database is rejected
+    with a bad request status.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        url (str): URL of the page to test.
+    """
+    cursor = urlsafe_b64encode(
+        f'2024-01-01T00:00:00+00:00|{2 ** 64}'.encode()
+    ).decode()
+    response = author_client.get(url, {'cursor': cursor})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_json_contains_news_title(
+    author_client, user_comments_json_url, comment
+):
+    """
+    Test that a comment in JSON carries its news title.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        user_comments_json_url (str): URL to the user comments JSON.
+        comment (fixture): Fixture that generates a comment to a news.
+    """
+    data = author_client.get(user_comments_json_url).json()
+    assert data['comments'][0]['news'] == {
+        'id': comment.news_id, 'title': NEWS_TITLE,
+    }
+    assert data['comments'][0]['text'] == COMMENT_TEXT
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is SQLite only'
+)
+def test_next_page_seeks_index(
+    author_client, user_comments_json_url, many_comments
+):
+    """
+    Test that a next page starts reading the (author, created) index at
+    the cursor instead of walking the newer comments.
+
+    Arguments:
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        user_comments_json_url (str): URL to the user comments JSON.
+        many_comments (fixture): Fixture that generates comments to a news.
+    """
+    cursor = author_client.get(user_comments_json_url).json()['next_cursor']
+    with CaptureQueriesContext(connection) as queries:
+        author_client.get(user_comments_json_url, {'cursor': cursor})
+    sql = next(
+        query['sql'] for query in queries.captured_queries
+        if 'news_comment' in query['sql']
+    )
+    with connection.cursor() as explain:
+        explain.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = '\n'.join(row[-1] for row in explain.fetchall())
+    assert 'comment_author_created_idx (author_id=? AND created<?)' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,152 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from .constants import FORM_COMMENT_TEXT
+from news.models import Comment, News
+from news.writebehind import PENDING_SESSION_KEY, CommentQueue, comment_queue
+
+
+pytestmark = pytest.mark.django_db
+
+PENDING_MARK = '(публикуется)'
+
+
+@pytest.fixture
+def write_behind(settings, monkeypatch):
+    """Enable write-behind; the queue is drained only by flush()."""
+    settings.COMMENT_WRITE_BEHIND = True
+    monkeypatch.setattr(comment_queue, 'autostart', False)
+    yield comment_queue
+    comment_queue.flush()
+
+
+def test_author_sees_queued_comment(
+    write_behind, author_client, detail_url
+):
+    """
+    Test that a queued comment is shown to its author before and after
+    it is written, and exactly once.
+
+    Arguments:
+        write_behind (news.writebehind.CommentQueue): Comment queue.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+    """
+    author_client.post(detail_url, data={'text': FORM_COMMENT_TEXT})
+    assert Comment.objects.count() == 0
+    content = author_client.get(detail_url).content.decode()
+    assert FORM_COMMENT_TEXT in content
+    assert PENDING_MARK in content
+    write_behind.flush()
+    assert Comment.objects.get().text == FORM_COMMENT_TEXT
+    content = author_client.get(detail_url).content.decode()
+    assert content.count(FORM_COMMENT_TEXT) == 1
+    assert PENDING_MARK not in content
+    assert not author_client.session[PENDING_SESSION_KEY]
+
+
+def test_queued_comment_is_hidden_from_others(
+    write_behind, author_client, client, detail_url
+):
+    """
+    Test that only the author sees the comment until it is written, and
+    that the write refreshes the cached page.
+
+    Arguments:
+        write_behind (news.writebehind.CommentQueue): Comment queue.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        client (django.test.Client): Django test client instance.
+        detail_url (str): URL to the news detail.
+    """
+    client.get(detail_url)
+    author_client.post(detail_url, data={'text': FORM_COMMENT_TEXT})
+    assert FORM_COMMENT_TEXT not in client.get(detail_url).content.decode()
+    write_behind.flush()
+    assert FORM_COMMENT_TEXT in client.get(detail_url).content.decode()
+
+
+def test_queued_comment_changes_etag(write_behind, author_client, detail_url):
+    """
+    Test that a revalidation does not hide the author's queued comment.
+
+    Arguments:
+        write_behind (news.writebehind.CommentQueue): Comment queue.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+    """
+    etag = author_client.get(detail_url)['ETag']
+    author_client.post(detail_url, data={'text': FORM_COMMENT_TEXT})
+    response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert FORM_COMMENT_TEXT in response.content.decode()
+
+
+def test_flush_writes_one_batch(
+    write_behind, author_client, detail_url
+):
+    """
+    Test that queued comments are written with a single INSERT.
+
+    Arguments:
+        write_behind (news.writebehind.CommentQueue): Comment queue.
+        author_client (django.test.Client): Django client instance.
+            Represents an author comment client.
+        detail_url (str): URL to the news detail.
+    """
+    for index in range(5):
+        author_client.post(
+            detail_url, data={'text': f'{FORM_COMMENT_TEXT} {index}'}
+        )
+    with CaptureQueriesContext(connection) as queries:
+        write_behind.flush()
+    inserts = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('INSERT')
+    ]
+    assert len(inserts) == 1
+    assert Comment.objects.count() == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_writes_queue(news, author):
+    """
+    Test that the worker thread writes queued comments.
+
+    Arguments:
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    queue = CommentQueue()
+    queue.put(Comment(
+        news=news, author=author, author_username=author.username,
+        text=FORM_COMMENT_TEXT,
+    ))
+    # Ждём, пока воркер обработает очередь, не забирая её себе.
+    queue.queue.join()
+    assert queue.worker.is_alive()
+    assert Comment.objects.get().text == FORM_COMMENT_TEXT
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_comment_does_not_drop_batch(news, author):
+    """
+    Test that a comment whose news was deleted while it was queued is
+    dropped alone and the rest of the batch is written.
+
+    Arguments:
+        news (fixture): Fixture that generates a news.
+        author (django.contrib.auth.get_user_model): User model instance.
+    """
+    deleted = News.objects.create(title='Удалённая', text='Текст')
+    queue = CommentQueue(autostart=False)
+    for comment_news in (news, deleted):
+        queue.put(Comment(
+            news=comment_news, author=author,
+            author_username=author.username, text=FORM_COMMENT_TEXT,
+        ))
+    deleted.delete()
+    queue.flush()
+    assert list(Comment.objects.values_list('news', flat=True)) == [news.pk]
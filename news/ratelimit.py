@@ -0,0 +1,118 @@
+"""
+Ограничение частоты изменяющих запросов скользящим окном в кэше.
+
+Для каждого ключа хранятся счётчики текущего и предыдущего окна.
+Число запросов за последние period секунд оценивается как счётчик
+текущего окна плюс доля предыдущего, равная его перекрытию со
+скользящим окном. Проверка стоит один get_many и один add или incr
+на ключ независимо от числа запросов.
+"""
+from http import HTTPStatus
+from math import floor
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+RATE_LIMIT_KEY = 'ratelimit:{scope}:{name}:{ident}:{window}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def get_retry_after(current, previous, limit, period, elapsed):
+    """Через сколько секунд оценка числа запросов станет меньше limit."""
+    if current >= limit:
+        # Ждём следующего окна, в котором текущий счётчик станет
+        # предыдущим, и пока его доля не опустится ниже лимита.
+        wait = period - elapsed + period * (1 - limit / current)
+    else:
+        wait = period * (1 - (limit - current) / previous) - elapsed
+    # Оценка должна стать строго меньше лимита.
+    return floor(wait) + 1
+
+
+def check_rate(scope, idents, limits, now=None):
+    """
+    Учитывает запрос и возвращает None или через сколько секунд его
+    можно повторить.
+
+    idents - значения, по которым считаются запросы, например
+    {'user': 1, 'ip': '127.0.0.1'}, limits - пары (число запросов,
+    период в секундах) для тех же имён. Отклонённый запрос не
+    учитывается, чтобы частые повторы не продлевали блокировку.
+    """
+    cache = caches[settings.RATE_LIMIT_CACHE]
+    now = time() if now is None else now
+    windows = []
+    for name, ident in idents.items():
+        limit, period = limits[name]
+        window, elapsed = divmod(now, period)
+        keys = [
+            RATE_LIMIT_KEY.format(
+                scope=scope, name=name, ident=ident, window=int(number)
+            )
+            for number in (window, window - 1)
+        ]
+        windows.append((*keys, limit, period, elapsed))
+    counts = cache.get_many(
+        [key for window in windows for key in window[:2]]
+    )
+    retry_after = None
+    for current, previous, limit, period, elapsed in windows:
+        current, previous = counts.get(current, 0), counts.get(previous, 0)
+        if current + previous * (1 - elapsed / period) >= limit:
+            retry_after = max(
+                retry_after or 0,
+                get_retry_after(current, previous, limit, period, elapsed),
+            )
+    if retry_after is not None:
+        return retry_after
+    for current, _, _, period, _ in windows:
+        # Счётчик нужен ещё одно окно, пока он остаётся предыдущим.
+        if not cache.add(current, 1, period * 2):
+            try:
+                cache.incr(current)
+            except ValueError:
+                # Счётчик истёк между add и incr, запрос не учтён.
+                pass
+    return None
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        'Слишком много запросов, повторите позже.',
+        content_type='text/plain; charset=utf-8',
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+    )
+    response['Retry-After'] = retry_after
+    return response
+
+
+class RateLimitMixin:
+    """
+    Ограничивает частоту изменяющих запросов пользователя и IP-адреса.
+
+    Лимиты берутся из настройки RATE_LIMITS[rate_limit_scope], так что
+    представления с одной областью делят общий лимит. Ставится после
+    LoginRequiredMixin, чтобы анонимные запросы отсекались раньше.
+    """
+    rate_limit_scope = None
+
+    def get_rate_limit_idents(self):
+        # За обратным прокси REMOTE_ADDR должен выставлять сам прокси:
+        # заголовкам X-Forwarded-For от клиента доверять нельзя.
+        idents = {'ip': self.request.META.get('REMOTE_ADDR')}
+        if self.request.user.is_authenticated:
+            idents['user'] = self.request.user.pk
+        return idents
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            retry_after = check_rate(
+                self.rate_limit_scope,
+                self.get_rate_limit_idents(),
+                settings.RATE_LIMITS[self.rate_limit_scope],
+            )
+            if retry_after is not None:
+                return too_many_requests(retry_after)
+        return super().dispatch(request, *args, **kwargs)
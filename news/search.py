@@ -0,0 +1,187 @@
+"""
+Полнотекстовый поиск по новостям на SQLite FTS5.
+
+Таблица news_search хранит заголовок и текст новости в виде основ слов,
+rowid совпадает с id новости. Встроенные токенизаторы FTS5 не умеют
+выделять основы русских слов, поэтому основы вычисляет функция SQL
+news_stem, которая регистрируется для каждого соединения, а триггеры
+на news_news обновляют индекс при любых изменениях, в том числе при
+bulk_create и update(). Таблица и триггеры создаются миграцией
+0007_news_search.
+"""
+import re
+from functools import lru_cache
+from threading import local
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+
+from .models import News
+
+SEARCH_TABLE = 'news_search'
+STEM_FUNCTION = 'news_stem'
+# Заголовок весит больше текста.
+RANK = f'bm25({SEARCH_TABLE}, 10.0, 1.0)'
+SNIPPET_WORDS = 12
+# Как и токенизатор unicode61, не считаем подчёркивание частью слова.
+WORD = re.compile(r'[^\W_]+')
+
+# Служебные слова из списка Snowball. Они есть почти в каждой новости
+# и не говорят о её теме, а запрос с ними читал бы весь индекс.
+STOP_WORDS = frozenset("""
+    а без более бы был была были было быть в вам вас вдруг ведь во вот
+    впрочем все всегда всего всех всю вы где да даже два для до другой
+    его ее ей ему если есть еще ж же за зачем здесь и из или им иногда
+    их к как какая какой когда конечно кто куда ли лучше между меня мне
+    много может можно мой моя мы на над надо наконец нас не него нее ней
+    нельзя нет ни нибудь никогда ним них ничего но ну о об один он она
+    они опять от перед по под после потом потому почти при про раз разве
+    с сам свою себе себя сейчас со совсем так такой там тебя тем теперь
+    то тогда того тоже только том тот три тут ты у уж уже хорошо хоть
+    чего чем через что чтоб чтобы чуть эти этого этой этом этот эту я
+""".split())
+
+_local = local()
+
+
+def get_stemmer():
+    # Стеммер хранит состояние, поэтому у каждого потока свой.
+    if not hasattr(_local, 'stemmer'):
+        # Пакет при импорте загружает стеммеры всех языков, это десятки
+        # миллисекунд запуска каждого процесса. Импортируем его, когда
+        # стеммер нужен: при поиске или изменении новостей.
+        import snowballstemmer
+
+        _local.stemmer = snowballstemmer.stemmer('russian')
+    return _local.stemmer
+
+
+@lru_cache(maxsize=100_000)
+def stem_word(word):
+    """
+    Основа слова, для служебного слова - пустая строка.
+
+    Словарь новостей невелик, основы кэшируются.
+    """
+    word = word.lower().replace('ё', 'е')
+    if word in STOP_WORDS:
+        return ''
+    return get_stemmer().stemWord(word)
+
+
+def get_stems(text):
+    return [stem for stem in map(stem_word, WORD.findall(text)) if stem]
+
+
+def stem_text(text):
+    """Текст для индекса: основы слов через пробел."""
+    if not text:
+        return ''
+    return ' '.join(get_stems(text))
+
+
+def register_functions(connection):
+    """Регистрирует news_stem в соединении sqlite3."""
+    connection.create_function(
+        STEM_FUNCTION, 1, stem_text, deterministic=True
+    )
+
+
+def build_match(query):
+    """
+    Запрос FTS5 по строке пользователя: все основы слов должны
+    встретиться в новости.
+
+    Основы берутся в кавычки, так что операторы FTS5 из строки
+    пользователя не интерпретируются.
+    """
+    return ' '.join(f'"{stem}"' for stem in dict.fromkeys(get_stems(query)))
+
+
+def parse_page(page, per_page):
+    """
+    Номер страницы из строки запроса.
+
+    Ранжируются только SEARCH_MAX_CANDIDATES совпадений, так что
+    страницы дальше последней, где они могут оказаться, пусты. Слишком
+    большой номер к тому же не помещается в целое SQLite.
+    """
+    try:
+        page = int(page or 1)
+    except ValueError:
+        raise BadRequest('Некорректный номер страницы.')
+    if not 1 <= page <= settings.SEARCH_MAX_CANDIDATES // per_page + 1:
+        raise BadRequest('Некорректный номер страницы.')
+    return page
+
+
+def search(query, page, per_page, candidates=None):
+    """
+    Страница результатов поиска и признак того, что есть следующая.
+
+    Новости упорядочены по релевантности и загружаются одним запросом
+    вместе с индексом. У каждой новости есть атрибут snippet.
+
+    Упорядочивание по rank вычисляет bm25 для каждого совпадения, и
+    запрос из частого слова стоил бы пропорционально размеру архива.
+    Поэтому ранжируются только candidates последних добавленных
+    совпадений: их находит обход индекса по убыванию rowid, который
+    останавливается на нужном числе записей.
+    """
+    match = build_match(query)
+    if not match:
+        return [], False
+    if candidates is None:
+        candidates = settings.SEARCH_MAX_CANDIDATES
+    table = News._meta.db_table
+    results = list(News.objects.raw(
+        f'SELECT {table}.id, {table}.title, {table}.text, {table}.date '
+        f'FROM (SELECT rowid, {RANK} AS score FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s) '
+        f'AS found JOIN {table} ON {table}.id = found.rowid '
+        f'ORDER BY found.score, found.rowid DESC LIMIT %s OFFSET %s',
+        (match, candidates, per_page + 1, (page - 1) * per_page),
+    ))
+    has_next = len(results) > per_page
+    results = results[:per_page]
+    stems = set(get_stems(query))
+    for news in results:
+        news.snippet = make_snippet(news.text, stems)
+    return results, has_next
+
+
+def make_snippet(text, stems, size=SNIPPET_WORDS):
+    """
+    Фрагмент текста вокруг первого найденного слова.
+
+    Найденные слова выделяются тегом mark. Если слова нашлись только
+    в заголовке, возвращается начало текста.
+    """
+    words = list(WORD.finditer(text))
+    found = next(
+        (
+            index for index, word in enumerate(words)
+            if stem_word(word.group()) in stems
+        ),
+        0,
+    )
+    start = max(found - size // 2, 0)
+    window = words[start:start + size]
+    if not window:
+        return ''
+    parts = ['… ' if start else '']
+    position = window[0].start() if start else 0
+    for word in window:
+        parts.append(escape(text[position:word.start()]))
+        if stem_word(word.group()) in stems:
+            parts.append(format_html('<mark>{}</mark>', word.group()))
+        else:
+            parts.append(escape(word.group()))
+        position = word.end()
+    if start + size < len(words):
+        parts.append(' …')
+    else:
+        parts.append(escape(text[position:]))
+    return mark_safe(''.join(parts))
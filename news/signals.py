@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_news
+from .models import Comment, News
+from .search import register_functions
+from .snapshot import refresh_home_snapshot
+
+
+@receiver((post_save, post_delete), sender=News)
+def invalidate_news_cache(sender, instance, **kwargs):
+    invalidate_news(instance.pk)
+    refresh_home_snapshot()
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment_cache(sender, instance, **kwargs):
+    invalidate_news(instance.news_id)
+    refresh_home_snapshot(instance.news_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def sync_comment_author_username(sender, instance, update_fields, **kwargs):
+    """Обновляет копию имени автора в его комментариях."""
+    if update_fields and sender.USERNAME_FIELD not in update_fields:
+        return
+    username = instance.get_username()
+    comments = Comment.objects.filter(author=instance).exclude(
+        author_username=username
+    )
+    news_ids = set(comments.values_list('news_id', flat=True).distinct())
+    if not news_ids:
+        return
+    # Новое время изменения сбрасывает закэшированные фрагменты.
+    comments.update(author_username=username, modified=timezone.now())
+    for news_id in news_ids:
+        invalidate_news(news_id)
+
+
+@receiver(connection_created)
+def register_search_functions(sender, connection, **kwargs):
+    """Триггеры поискового индекса вызывают news_stem, см. news/search.py."""
+    if connection.vendor == 'sqlite':
+        register_functions(connection.connection)
@@ -0,0 +1,194 @@
+"""
+Снимок главной страницы.
+
+Главная показывает несколько последних новостей с началом текста и
+числом комментариев. Снимок хранит эти строки уже подготовленными для
+шаблона, так что страница читает один ключ кэша, а не выбирает новости
+и считает комментарии на каждый запрос.
+
+Снимок обновляется после изменений: комментарий к новости не с главной
+его не трогает, комментарий к новости с главной пересчитывает одну
+строку, изменение новостей строит снимок заново. Как и закэшированные
+ответы, снимок хранится под версией: снимок, собранный по устаревшим
+данным, сохранится под старой версией и не будет прочитан.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import Truncator
+
+from yanews.routers import read_primary
+
+from .cache import bump_version, get_version
+from .models import Comment, News
+
+HOME_SNAPSHOT_KEY = 'news:home:snapshot'
+SUMMARY_WORDS = 15
+SNAPSHOT_FIELDS = ('id', 'title', 'text', 'date', 'comment_count')
+
+
+def annotate_comment_stats(queryset):
+    """
+    Добавляет к новостям число комментариев и время последнего изменения
+    комментария.
+
+    Подзапросы читают только индексы комментариев, сами комментарии
+    не загружаются.
+    """
+    comments = Comment.objects.filter(
+        news=OuterRef('pk')
+    ).order_by().values('news')
+    return queryset.annotate(
+        comment_count=Coalesce(
+            Subquery(
+                comments.annotate(count=Count('pk')).values('count'),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        last_comment=Subquery(
+            comments.annotate(last=Max('modified')).values('last')
+        ),
+    )
+
+
+def make_entry(values):
+    """Строка снимка: текст новости заменён его началом, как на главной."""
+    entry = dict(values)
+    text = entry.pop('text')
+    # Так же обрезает фильтр truncatewords.
+    entry['summary'] = Truncator(text).words(SUMMARY_WORDS, truncate=' …')
+    return entry
+
+
+def get_home_queryset():
+    """
+    Выводим только несколько последних новостей.
+
+    Их количество определяется в настройках проекта.
+    """
+    return annotate_comment_stats(News.objects.all()).values(
+        *SNAPSHOT_FIELDS
+    )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+
+def build_home_snapshot():
+    """Строки главной страницы одним запросом, без экземпляров моделей."""
+    return [make_entry(values) for values in get_home_queryset()]
+
+
+def update_home_snapshot(snapshot, news_id):
+    """Снимок, в котором заново прочитана строка одной новости."""
+    values = annotate_comment_stats(News.objects.filter(pk=news_id)).values(
+        *SNAPSHOT_FIELDS
+    ).first()
+    if values is None:
+        # Новость удалена вместе с комментариями, её место займёт другая.
+        return build_home_snapshot()
+    return [
+        make_entry(values) if entry['id'] == news_id else entry
+        for entry in snapshot
+    ]
+
+
+def get_home_snapshot():
+    """Снимок главной; если его нет, он строится и сохраняется."""
+    version = get_version(HOME_SNAPSHOT_KEY)
+    snapshot = cache.get(HOME_SNAPSHOT_KEY, version=version)
+    if snapshot is None:
+        # Снимок хранится до изменения данных, но не дольше
+        # NEWS_CACHE_TIMEOUT, см. read_primary().
+        read_primary()
+        snapshot = build_home_snapshot()
+        cache.set(
+            HOME_SNAPSHOT_KEY, snapshot, settings.NEWS_CACHE_TIMEOUT,
+            version=version,
+        )
+    return snapshot
+
+
+def is_off_home(snapshot, news_id):
+    """Изменились комментарии новости, которой нет в снимке главной."""
+    return (
+        news_id is not None and snapshot is not None
+        and all(entry['id'] != news_id for entry in snapshot)
+    )
+
+
+class HomeSnapshotRefresh:
+    """
+    Сохранение снимка после фиксации транзакции.
+
+    Одно на транзакцию: изменения, сделанные в ней после первого,
+    увеличивают версию и добавляются к нему. Иначе удаление новости
+    с тысячами комментариев, которое отправляет сигнал на каждый
+    комментарий, перестроило бы снимок тысячи раз.
+    """
+
+    def __init__(self, snapshot, version):
+        self.snapshot = snapshot
+        self.new_version = version
+        self.news_ids = set()
+        self.consistent = snapshot is not None
+        self.done = False
+
+    def add(self, news_id):
+        if is_off_home(self.snapshot, news_id):
+            return
+        new_version = bump_version(HOME_SNAPSHOT_KEY)
+        if new_version != self.new_version + 1:
+            self.consistent = False
+        self.new_version = new_version
+        self.news_ids.add(news_id)
+
+    def build(self):
+        if None in self.news_ids or not self.consistent:
+            # Прочитанный снимок нельзя дополнить, если его нет, если
+            # изменились сами новости или если между чтением и
+            # увеличением версии снимок изменил кто-то ещё.
+            return build_home_snapshot()
+        snapshot = self.snapshot
+        for news_id in self.news_ids:
+            snapshot = update_home_snapshot(snapshot, news_id)
+        return snapshot
+
+    def __call__(self):
+        self.done = True
+        cache.set(
+            HOME_SNAPSHOT_KEY, self.build(), settings.NEWS_CACHE_TIMEOUT,
+            version=self.new_version,
+        )
+
+
+def get_pending_refresh():
+    """Ещё не выполненное обновление снимка в текущей транзакции."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    for _, callback in connection.run_on_commit:
+        if isinstance(callback, HomeSnapshotRefresh) and not callback.done:
+            return callback
+    return None
+
+
+def refresh_home_snapshot(news_id=None):
+    """
+    Обновляет снимок после изменения комментариев новости news_id или,
+    если она не указана, после изменения самих новостей.
+
+    Версия снимка увеличивается сразу, а новый снимок сохраняется после
+    фиксации транзакции: до неё запрос может прочитать старые данные.
+    """
+    pending = get_pending_refresh()
+    if pending is not None:
+        pending.add(news_id)
+        return
+    version = get_version(HOME_SNAPSHOT_KEY)
+    snapshot = cache.get(HOME_SNAPSHOT_KEY, version=version)
+    if is_off_home(snapshot, news_id):
+        return
+    refresh = HomeSnapshotRefresh(snapshot, version)
+    refresh.add(news_id)
+    transaction.on_commit(refresh)
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -26,17 +27,21 @@ class TestHomePage(TestCase):
             for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
         )
 
+    def setUp(self):
+        # Анонимные ответы кэшируются, а данные класса создаются один раз.
+        cache.clear()
+
     def test_news_count(self):
         response = self.client.get(self.HOME_URL)
         # Получаем список объектов из словаря контекста.
         object_list = response.context['object_list']
-        news_count = object_list.count()
+        news_count = len(object_list)
         self.assertEqual(news_count, settings.NEWS_COUNT_ON_HOME_PAGE)
 
     def test_news_order(self):
         response = self.client.get(self.HOME_URL)
         object_list = response.context['object_list']
-        all_dates = [news.date for news in object_list]
+        all_dates = [news['date'] for news in object_list]
         sorted_dates = sorted(all_dates, reverse=True)
         self.assertEqual(all_dates, sorted_dates)
 
@@ -57,6 +62,9 @@ class TestDetailPage(TestCase):
             comment.created = now + timedelta(days=index)
             comment.save()
 
+    def setUp(self):
+        cache.clear()
+
     def test_comments_order(self):
         response = self.client.get(self.detail_url)
         self.assertIn('news', response.context)
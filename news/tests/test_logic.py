@@ -12,6 +12,9 @@ User = get_user_model()
 
 class TestCommentCreation(TestCase):
     COMMENT_TEXT = 'Текст комментария'
+    # Пользователь, новость и вставка комментария. Сессия читается
+    # из кэша.
+    CREATE_QUERIES = 3
 
     @classmethod
     def setUpTestData(cls):
@@ -38,6 +41,10 @@ class TestCommentCreation(TestCase):
         self.assertEqual(comment.news, self.news)
         self.assertEqual(comment.author, self.user)
 
+    def test_create_comment_query_budget(self):
+        with self.assertNumQueries(self.CREATE_QUERIES):
+            self.auth_client.post(self.url, data=self.form_data)
+
     def test_user_cant_use_bad_words(self):
         bad_words_data = {'text': f'Какой-то текст, {BAD_WORDS[0]}, еще текст'}
         response = self.auth_client.post(self.url, data=bad_words_data)
@@ -54,6 +61,9 @@ class TestCommentCreation(TestCase):
 class TestCommentEditDelete(TestCase):
     COMMENT_TEXT = 'Текст комментария'
     NEW_COMMENT_TEXT = 'Обновлённый комментарий'
+    # Пользователь, комментарий вместе с новостью и запись.
+    EDIT_QUERIES = 3
+    DELETE_QUERIES = 3
 
     @classmethod
     def setUpTestData(cls):
@@ -93,6 +103,12 @@ class TestCommentEditDelete(TestCase):
         self.comment.refresh_from_db()
         self.assertEqual(self.comment.text, self.NEW_COMMENT_TEXT)
 
+    def test_edit_and_delete_query_budget(self):
+        with self.assertNumQueries(self.EDIT_QUERIES):
+            self.author_client.post(self.edit_url, data=self.form_data)
+        with self.assertNumQueries(self.DELETE_QUERIES):
+            self.author_client.post(self.delete_url)
+
     def test_user_cant_edit_comment_of_another_user(self):
         response = self.reader_client.post(self.edit_url, data=self.form_data)
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
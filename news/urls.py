@@ -1,20 +1,54 @@
+from django.conf import settings
 from django.urls import path
 
 from news import views
 
 app_name = 'news'
 
+# Под ASGI новости читаются асинхронными представлениями.
+if settings.NEWS_ASYNC_VIEWS:
+    news_list_view = views.AsyncNewsList
+    news_detail_view = views.AsyncNewsDetailView
+else:
+    news_list_view = views.NewsList
+    news_detail_view = views.NewsDetailView
+
 urlpatterns = [
     path(
         '',
-        views.NewsList.as_view(),
+        news_list_view.as_view(),
         name='home'
     ),
     path(
         'news/<int:pk>/',
-        views.NewsDetailView.as_view(),
+        news_detail_view.as_view(),
         name='detail',
     ),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsComments.as_view(),
+        name='comments',
+    ),
+    path(
+        'search/',
+        views.NewsSearch.as_view(),
+        name='search',
+    ),
+    path(
+        'my_comments/',
+        views.UserComments.as_view(),
+        name='user_comments',
+    ),
+    path(
+        'api/my_comments/',
+        views.UserCommentsJSON.as_view(),
+        name='user_comments_json',
+    ),
+    path(
+        'export/',
+        views.NewsExport.as_view(),
+        name='export',
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
@@ -1,53 +1,216 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin, UserPassesTestMixin
+)
+from django.core.exceptions import BadRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.views import generic
 
+from yanews.routers import read_primary
+
+from .cache import (
+    HOME_CACHE_KEY, AnonymousCacheMixin, ConditionalGetMixin,
+    get_detail_cache_key, revalidate
+)
+from .export import CONTENT_TYPES, export
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import paginate_by_keyset
+from .ratelimit import RateLimitMixin
+from .search import parse_page, search
+from .snapshot import annotate_comment_stats, get_home_snapshot
+from .writebehind import enqueue_comment, get_pending_comments
 
 
-class NewsList(generic.ListView):
+class NewsList(AnonymousCacheMixin, ConditionalGetMixin, generic.ListView):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
 
-    def get_queryset(self):
-        """
-        Выводим только несколько последних новостей.
+    def get_cache_key(self):
+        return HOME_CACHE_KEY
 
-        Их количество определяется в настройках проекта.
-        """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+    def load(self):
+        # Страница отрисовывается по снимку, см. news/snapshot.py.
+        self.object_list = get_home_snapshot()
+
+    def get_etag_data(self):
+        return [
+            (
+                news['id'], news['title'], news['summary'], news['date'],
+                news['comment_count'],
+            )
+            for news in self.object_list
+        ]
 
 
-class NewsDetail(generic.DetailView):
+COMMENT_PAGE_FIELDS = (
+    'news_id', 'author_id', 'author_username', 'text', 'created', 'modified'
+)
+
+
+def get_comments_page(news_id, cursor=None):
+    """Страница комментариев к новости и курсор следующей страницы."""
+    return paginate_by_keyset(
+        Comment.objects.filter(news_id=news_id).only(*COMMENT_PAGE_FIELDS),
+        cursor,
+        settings.COMMENTS_COUNT_ON_DETAIL_PAGE,
+    )
+
+
+class NewsDetail(
+        AnonymousCacheMixin, ConditionalGetMixin, generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
 
+    def get_cache_key(self):
+        return get_detail_cache_key(self.kwargs['pk'])
+
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
+        return get_object_or_404(
+            annotate_comment_stats(self.model.objects.all()),
+            pk=self.kwargs['pk'],
+        )
+
+    def load(self):
+        self.object = self.get_object()
+        self.pending_comments = []
+        if (
+            settings.COMMENT_WRITE_BEHIND
+            and self.request.user.is_authenticated
+        ):
+            self.pending_comments = get_pending_comments(
+                self.request, self.object.pk
+            )
+
+    def get_etag_data(self):
+        # Число комментариев меняется при удалении, время последнего
+        # изменения - при добавлении, правке и смене имени автора.
+        news = self.object
+        return (
+            news.pk, news.title, news.text, news.date,
+            news.comment_count, news.last_comment,
+            [comment.created for comment in self.pending_comments],
         )
-        return obj
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_comments_page(
+            self.object.pk
+        )
+        context['pending_comments'] = self.pending_comments
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
+class NewsComments(generic.TemplateView):
+    """Фрагмент со следующей страницей комментариев к новости."""
+    template_name = 'includes/comments.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        news_id = self.kwargs['pk']
+        if not News.objects.filter(pk=news_id).exists():
+            raise Http404
+        context['news_id'] = news_id
+        context['comments'], context['next_cursor'] = get_comments_page(
+            news_id, self.request.GET.get('cursor')
+        )
+        return context
+
+
+USER_COMMENT_FIELDS = ('news', 'news__title', 'text', 'created')
+
+
+def get_user_comments_page(user, cursor=None):
+    """
+    Страница комментариев пользователя от новых к старым и курсор
+    следующей страницы.
+
+    Выборка идёт по индексу (author, created), из новости читается
+    только заголовок.
+    """
+    return paginate_by_keyset(
+        Comment.objects.filter(author_id=user.pk).select_related(
+            'news'
+        ).only(*USER_COMMENT_FIELDS),
+        cursor,
+        settings.COMMENTS_COUNT_ON_USER_PAGE,
+        descending=True,
+    )
+
+
+class UserComments(LoginRequiredMixin, generic.TemplateView):
+    """Комментарии текущего пользователя."""
+    template_name = 'news/user_comments.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_user_comments_page(
+            self.request.user, self.request.GET.get('cursor')
+        )
+        return context
+
+
+class UserCommentsJSON(LoginRequiredMixin, generic.View):
+    """Комментарии текущего пользователя в JSON."""
+    # API отвечает 403, а не перенаправляет на страницу входа.
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        comments, next_cursor = get_user_comments_page(
+            request.user, request.GET.get('cursor')
+        )
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.pk,
+                    'news': {
+                        'id': comment.news_id, 'title': comment.news.title,
+                    },
+                    'text': comment.text,
+                    'created': comment.created,
+                }
+                for comment in comments
+            ],
+            'next_cursor': next_cursor,
+        })
+
+
+class NewsSearch(generic.TemplateView):
+    """Полнотекстовый поиск по новостям."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        per_page = settings.SEARCH_RESULTS_PER_PAGE
+        page = parse_page(self.request.GET.get('page'), per_page)
+        context['results'], context['has_next'] = search(
+            query, page, per_page
+        )
+        context['query'] = query
+        context['page'] = page
+        return context
+
+
 class NewsComment(
         LoginRequiredMixin,
+        RateLimitMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
     model = News
+    rate_limit_scope = 'comments'
     form_class = CommentForm
     template_name = 'news/detail.html'
 
@@ -59,12 +222,23 @@ class NewsComment(
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        if settings.COMMENT_WRITE_BEHIND:
+            enqueue_comment(self.request, comment)
+        else:
+            comment.save()
         return super().form_valid(form)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = get_comments_page(
+            self.object.pk
+        )
+        return context
+
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
@@ -78,19 +252,112 @@ class NewsDetailView(generic.View):
         return view(request, *args, **kwargs)
 
 
-class CommentBase(LoginRequiredMixin):
+# Отрисовка шаблонов асинхронных представлений. Пул ограничен, чтобы
+# медленные клиенты не порождали неограниченное число потоков.
+RENDER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_RENDER_WORKERS,
+    thread_name_prefix='news-render',
+)
+
+
+class AsyncViewMixin:
+    """
+    Делает представление-класс корутиной для обработчика запросов.
+
+    Django 3.2 распознаёт асинхронными только функции-представления,
+    поэтому результат as_view оборачивается в async def.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        return async_view
+
+
+class AsyncReadMixin(AsyncViewMixin):
+    """
+    Асинхронное чтение для ASGI.
+
+    Данные загружаются через sync_to_async, потому что ORM синхронный,
+    а шаблон отрисовывается в RENDER_EXECUTOR. Цикл событий при этом
+    не блокируется. Кэш анонимных ответов и условные запросы работают
+    как в синхронных представлениях.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        response, context = await sync_to_async(self.load_page)()
+        if response is None:
+            response = self.render_to_response(context)
+        return self.set_validators(response)
+
+    async def dispatch(self, request, *args, **kwargs):
+        # is_cacheable загружает пользователя из сессии, после этого
+        # шаблон не обращается к БД.
+        cacheable = await sync_to_async(self.is_cacheable)()
+        if cacheable:
+            response = await sync_to_async(self.get_cached_response)()
+            if response is not None:
+                return revalidate(request, response)
+            read_primary()
+        response = generic.View.dispatch(self, request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        if cacheable:
+            self.cache_response(response)
+        if hasattr(response, 'render'):
+            await asyncio.get_running_loop().run_in_executor(
+                RENDER_EXECUTOR, response.render
+            )
+        return response
+
+
+class AsyncNewsList(AsyncReadMixin, NewsList):
+    """Асинхронная версия NewsList."""
+
+
+class AsyncNewsDetail(AsyncReadMixin, NewsDetail):
+    """Асинхронная версия NewsDetail."""
+
+
+class AsyncNewsDetailView(AsyncViewMixin, generic.View):
+
+    async def get(self, request, *args, **kwargs):
+        view = AsyncNewsDetail.as_view()
+        return await view(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        view = sync_to_async(NewsComment.as_view())
+        return await view(request, *args, **kwargs)
+
+
+class CommentBase(LoginRequiredMixin, RateLimitMixin):
     """Базовый класс для работы с комментариями."""
     model = Comment
+    rate_limit_scope = 'comments'
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
-        """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        """
+        Пользователь может работать только со своими комментариями.
+
+        Новость подгружается сразу: её заголовок выводится на страницах
+        редактирования и удаления.
+        """
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -102,3 +369,22 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+
+class NewsExport(UserPassesTestMixin, generic.View):
+    """Потоковая выгрузка новостей с комментариями для персонала."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        format = request.GET.get('format', 'jsonl')
+        if format not in CONTENT_TYPES:
+            raise BadRequest('Неизвестный формат выгрузки.')
+        response = StreamingHttpResponse(
+            export(format), content_type=CONTENT_TYPES[format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="news.{format}"'
+        )
+        return response
@@ -0,0 +1,201 @@
+"""
+Отложенная запись комментариев пачками.
+
+Включается настройкой COMMENT_WRITE_BEHIND. Проверенный формой
+комментарий ставится в очередь процесса, а поток-воркер записывает
+накопившиеся комментарии одной транзакцией. Вместо транзакции на
+каждый запрос блокировку записи SQLite берёт одна транзакция на пачку.
+
+Пока комментарий в очереди, автор видит его из сессии: сессия общая
+для всех процессов, так что следующий запрос может попасть в любой.
+Цена - комментарии, не записанные до аварийного завершения процесса,
+теряются. При обычной остановке очередь дописывается.
+"""
+import atexit
+import logging
+from datetime import datetime, timedelta
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .cache import invalidate_news
+from .models import Comment
+from .snapshot import refresh_home_snapshot
+
+PENDING_SESSION_KEY = 'pending_comments'
+
+logger = logging.getLogger(__name__)
+
+
+class CommentQueue:
+    """
+    Очередь комментариев с потоком, который записывает их пачками.
+
+    Поток запускается при первом комментарии, если autostart истинно.
+    flush() дописывает очередь в вызывающем потоке, например в тестах.
+    """
+
+    def __init__(self, autostart=True):
+        self.autostart = autostart
+        self.queue = Queue()
+        self.worker = None
+        self.lock = Lock()
+
+    def put(self, comment):
+        self.queue.put(comment)
+        if self.autostart:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = Thread(
+                    target=self.run, name='comment-queue', daemon=True
+                )
+                self.worker.start()
+
+    def run(self):
+        while True:
+            self.write(self.get_batch())
+            # Закрывает соединение, если оно сломано или устарело.
+            close_old_connections()
+
+    def get_batch(self):
+        """
+        Ждёт первый комментарий и добирает к нему пачку не дольше
+        COMMENT_QUEUE_MAX_DELAY секунд.
+        """
+        batch = [self.queue.get()]
+        deadline = monotonic() + settings.COMMENT_QUEUE_MAX_DELAY
+        while len(batch) < settings.COMMENT_QUEUE_BATCH_SIZE:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except Empty:
+                break
+        return batch
+
+    def write(self, batch):
+        try:
+            written = self.save(batch)
+            # bulk_create не отправляет сигналы, сбрасываем кэш сами.
+            for news_id in {comment.news_id for comment in written}:
+                invalidate_news(news_id)
+                refresh_home_snapshot(news_id)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    def save(self, batch):
+        """
+        Записывает пачку одной транзакцией и возвращает записанное.
+
+        Если пачка не записалась, например новость комментария удалили,
+        пока он ждал в очереди, комментарии пишутся по одному и теряются
+        только те, что не записываются сами по себе.
+        """
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch)
+        except Exception:
+            if len(batch) == 1:
+                logger.exception('Не удалось записать комментарий')
+                return []
+        else:
+            return batch
+        logger.warning(
+            'Не удалось записать пачку из %d комментариев, пишем по одному',
+            len(batch),
+        )
+        written = []
+        for comment in batch:
+            written += self.save([comment])
+        return written
+
+    def flush(self):
+        """Дописывает очередь и ждёт пачку, которую пишет воркер."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+        if batch:
+            self.write(batch)
+        self.queue.join()
+
+
+comment_queue = CommentQueue()
+atexit.register(comment_queue.flush)
+
+
+def enqueue_comment(request, comment):
+    """Ставит комментарий в очередь и запоминает его в сессии автора."""
+    comment.author_username = comment.author.get_username()
+    # Время записи поставит bulk_create, это время показа автору.
+    comment.created = comment.modified = timezone.now()
+    comment_queue.put(comment)
+    request.session.setdefault(PENDING_SESSION_KEY, []).append({
+        'news_id': comment.news_id,
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+    })
+    request.session.modified = True
+
+
+def get_pending_comments(request, news_id):
+    """
+    Комментарии автора к новости, которые ещё не записаны.
+
+    Записанные и слишком старые комментарии удаляются из сессии.
+    Запрос к БД выполняется, только если в сессии что-то есть.
+    """
+    pending = request.session.get(PENDING_SESSION_KEY)
+    if not pending:
+        return []
+    expired = timezone.now() - timedelta(
+        seconds=settings.COMMENT_PENDING_TIMEOUT
+    )
+    pending = [
+        {**entry, 'created': datetime.fromisoformat(entry['created'])}
+        for entry in pending
+    ]
+    others = [
+        entry for entry in pending
+        if entry['news_id'] != news_id and entry['created'] > expired
+    ]
+    entries = [
+        entry for entry in pending
+        if entry['news_id'] == news_id and entry['created'] > expired
+    ]
+    if entries:
+        # Запись получает время не раньше постановки в очередь.
+        written = set(Comment.objects.filter(
+            news_id=news_id,
+            author=request.user,
+            text__in={entry['text'] for entry in entries},
+            created__gte=min(entry['created'] for entry in entries),
+        ).values_list('text', flat=True))
+        entries = [entry for entry in entries if entry['text'] not in written]
+    if len(others) + len(entries) != len(pending):
+        request.session[PENDING_SESSION_KEY] = [
+            {**entry, 'created': entry['created'].isoformat()}
+            for entry in others + entries
+        ]
+    return [
+        Comment(
+            news_id=news_id,
+            author=request.user,
+            author_username=request.user.get_username(),
+            text=entry['text'],
+            created=entry['created'],
+            modified=entry['created'],
+        )
+        for entry in entries
+    ]
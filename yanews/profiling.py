@@ -0,0 +1,130 @@
+"""
+Профилирование запросов.
+
+Включается переменной окружения YANEWS_PROFILING=1. Выключенный
+middleware исключается из цепочки при старте и ничего не стоит.
+"""
+from collections import defaultdict
+from contextlib import ExitStack
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, JsonResponse
+
+UNRESOLVED = '<unresolved>'
+FIELDS = (
+    'total_ms', 'sql_queries', 'sql_ms', 'template_ms', 'response_bytes'
+)
+
+_stats = defaultdict(lambda: dict.fromkeys(('requests', 'max_ms', *FIELDS), 0))
+_stats_lock = Lock()
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.total_ms = 0
+        self.sql_queries = 0
+        self.sql_ms = 0
+        self.template_ms = 0
+        self.response_bytes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (perf_counter() - start) * 1000
+            self.sql_queries += 1
+
+    def server_timing(self):
+        return (
+            f'total;dur={self.total_ms:.2f}, '
+            f'sql;dur={self.sql_ms:.2f};desc="{self.sql_queries} queries", '
+            f'template;dur={self.template_ms:.2f}'
+        )
+
+
+def record(view_name, profile):
+    with _stats_lock:
+        stats = _stats[view_name]
+        stats['requests'] += 1
+        stats['max_ms'] = max(stats['max_ms'], profile.total_ms)
+        for field in FIELDS:
+            stats[field] += getattr(profile, field)
+
+
+def get_stats():
+    """Средние значения по каждому имени маршрута."""
+    with _stats_lock:
+        return {
+            view_name: {
+                'requests': stats['requests'],
+                'max_ms': round(stats['max_ms'], 2),
+                **{
+                    f'avg_{field}': round(
+                        stats[field] / stats['requests'], 2
+                    )
+                    for field in FIELDS
+                },
+            }
+            for view_name, stats in _stats.items()
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class ProfilingMiddleware:
+    """
+    Замеряет время запроса, SQL и отрисовки шаблонов.
+
+    Результат отдаётся в заголовке Server-Timing и накапливается
+    по именам маршрутов. Должен стоять первым в MIDDLEWARE, чтобы
+    учитывать работу остальных middleware.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = request.profile = RequestProfile()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        profile.total_ms = (perf_counter() - start) * 1000
+        if not response.streaming:
+            profile.response_bytes = len(response.content)
+        response['Server-Timing'] = profile.server_timing()
+        match = request.resolver_match
+        record(match.view_name if match else UNRESOLVED, profile)
+        return response
+
+    def process_template_response(self, request, response):
+        # Шаблон отрисовывается сразу после этого хука, а middleware
+        # стоит первым и вызывается последним. Асинхронные представления
+        # отрисовывают шаблон сами, их время входит только в total.
+        start = perf_counter()
+
+        def finish(response):
+            request.profile.template_ms += (perf_counter() - start) * 1000
+
+        response.add_post_render_callback(finish)
+        return response
+
+
+@staff_member_required
+def stats_view(request):
+    if not settings.PROFILING_ENABLED:
+        raise Http404
+    return JsonResponse(get_stats(), json_dumps_params={'indent': 2})
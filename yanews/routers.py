@@ -0,0 +1,109 @@
+"""
+Чтение новостей с реплик.
+
+Реплики перечисляются в настройке REPLICA_DATABASES, локально это копии
+файла SQLite, которые обновляет команда replicate_db. Реплики отстают
+от основной базы, поэтому читают с них только безопасные запросы:
+
+- изменяющие запросы читают и пишут основную базу;
+- после записи ответ ставит cookie, и следующие REPLICA_PIN_SECONDS
+  секунд пользователь читает основную базу, в том числе страницу, на
+  которую его перенаправили, и видит свои изменения;
+- данные, которые кэшируются до следующего изменения, читаются с
+  основной базы, см. read_primary().
+
+Вне запросов - в командах и в фоновых потоках - всё идёт в основную
+базу. Без реплик middleware исключается из цепочки при старте.
+"""
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_COOKIE = 'yanews_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@dataclass
+class RequestState:
+    """Куда читает текущий запрос и была ли в нём запись."""
+    replica: str
+    primary: bool = False
+    wrote: bool = False
+
+
+_state = ContextVar('replica_state', default=None)
+
+
+def read_primary():
+    """
+    Остаток текущего запроса читает основную базу.
+
+    Для данных, которые кэшируются до следующего изменения: собранные
+    по отстающей реплике, они сохранились бы под новой версией кэша.
+    """
+    state = _state.get()
+    if state is not None:
+        state.primary = True
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.primary:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = state.primary = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики - копии основной базы, объекты из них совместимы.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схему на реплики переносит replicate_db вместе с данными.
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    """
+    Выбирает реплику для запроса и закрепляет пользователя за основной
+    базой после записи.
+
+    Реплика выбирается одна на запрос, чтобы все его запросы читали один
+    снимок данных.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RequestState(
+            replica=random.choice(settings.REPLICA_DATABASES),
+            primary=(
+                request.method not in SAFE_METHODS
+                or PRIMARY_COOKIE in request.COOKIES
+            ),
+        )
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                PRIMARY_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -6,6 +7,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
 
+# Настройки для разработки. В продакшене используется
+# yanews/settings_production.py.
 DEBUG = True
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
@@ -21,6 +24,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'yanews.profiling.ProfilingMiddleware',
+    # До сессий: сессия тоже читается из базы.
+    'yanews.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -30,14 +36,23 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Профилирование запросов, см. yanews/profiling.py.
+PROFILING_ENABLED = os.getenv('YANEWS_PROFILING') == '1'
+# Прогрев процесса до первого запроса, см. yanews/warmup.py.
+WARMUP_ON_START = os.getenv('YANEWS_WARMUP') == '1'
+
 ROOT_URLCONF = 'yanews.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Без кэша: изменённый шаблон виден без перезапуска сервера.
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -53,11 +68,94 @@ WSGI_APPLICATION = 'yanews.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # Стандартный бэкенд SQLite, дополнительно выполняющий PRAGMAS.
+        'ENGINE': 'yanews.sqlite3',
+        'NAME': os.getenv('YANEWS_DATABASE', BASE_DIR / 'db.sqlite3'),
+        # Соединение переиспользуется между запросами.
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            # Сколько секунд ждать освобождения блокировки записи.
+            'timeout': 20,
+        },
+        'PRAGMAS': {
+            # Читатели не ждут пишущих, а запись не блокирует чтение.
+            'journal_mode': 'WAL',
+            # В режиме WAL безопасно и не требует fsync на каждую запись.
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            # Отрицательное значение задаёт размер в килобайтах.
+            'cache_size': -64 * 1024,
+            'temp_store': 'MEMORY',
+        },
     }
 }
 
+# Реплики для чтения - файлы SQLite через запятую, их обновляет команда
+# replicate_db. Маршрутизация описана в yanews/routers.py.
+REPLICA_DATABASES = []
+for number, name in enumerate(filter(
+    None, os.getenv('YANEWS_DATABASE_REPLICAS', '').split(',')
+)):
+    REPLICA_DATABASES.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': name,
+        # Тесты читают реплику через соединение с основной базой.
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['yanews.routers.ReplicaRouter']
+# Сколько секунд после записи пользователь читает основную базу. Должно
+# превышать отставание реплик: интервал replicate_db и время копирования.
+REPLICA_PIN_SECONDS = 30
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Отрисованные комментарии, см. templates/includes/comments.html.
+    # Их много и они не устаревают, поэтому они лежат отдельно и при
+    # переполнении вытесняют друг друга, а не ответы и версии из default.
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Счётчики ограничения частоты, см. news/ratelimit.py. В default их
+    # вытесняли бы ответы анонимам, и лимит можно было бы обойти.
+    # На каждого пишущего пользователя и IP - по два счётчика.
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ratelimit',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Файловый кэш общий для всех процессов на машине: выход из аккаунта
+    # в одном процессе сразу виден остальным. Каталог по умолчанию лежит
+    # в проекте, а не в общем /tmp, где его могут подменить другие
+    # пользователи машины.
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv(
+            'YANEWS_SESSION_CACHE_DIR', BASE_DIR / 'cache' / 'sessions'
+        ),
+    },
+}
+
+# cached_db читает сессию из кэша sessions и обращается к БД только при
+# промахе; signed_cookies хранит сессию в подписанной cookie без БД.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[
+    os.getenv('YANEWS_SESSION_ENGINE', 'cached_db')
+]
+SESSION_CACHE_ALIAS = 'sessions'
+# Тесты не пишут сессии в каталог кэша сессий, см. yanews/test_runner.py.
+TEST_RUNNER = 'yanews.test_runner.TestRunner'
+# Сессия записывается, только если она изменилась.
+SESSION_SAVE_EVERY_REQUEST = False
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +178,40 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+COMMENTS_COUNT_ON_DETAIL_PAGE = 50
+COMMENTS_COUNT_ON_USER_PAGE = 50
+SEARCH_RESULTS_PER_PAGE = 10
+# Сколько последних совпадений ранжирует поиск, см. news/search.py.
+SEARCH_MAX_CANDIDATES = 2000
+# Ответы анонимам и снимок главной сбрасываются сигналами, но только в
+# кэше процесса, где изменились данные: кэш default у каждого процесса
+# свой. Остальные процессы отдают старый ответ не дольше этого срока.
+# С общим кэшем (memcached, redis) срок можно снять, указав None.
+NEWS_CACHE_TIMEOUT = 60
+
+# Асинхронные представления для чтения новостей, включаются под ASGI.
+NEWS_ASYNC_VIEWS = os.getenv('YANEWS_ASYNC_VIEWS') == '1'
+ASYNC_RENDER_WORKERS = 8
+
+# Отложенная запись комментариев пачками, см. news/writebehind.py.
+COMMENT_WRITE_BEHIND = os.getenv('YANEWS_COMMENT_WRITE_BEHIND') == '1'
+COMMENT_QUEUE_BATCH_SIZE = 200
+# Сколько секунд воркер добирает пачку после первого комментария.
+COMMENT_QUEUE_MAX_DELAY = 0.05
+# Сколько секунд автор видит свой комментарий из сессии.
+COMMENT_PENDING_TIMEOUT = 60
+
+# Лимиты изменяющих запросов по областям: для каждого ключа - число
+# запросов и период в секундах. Создание, правка и удаление комментариев
+# делят общий лимит.
+RATE_LIMITS = {
+    'comments': {'user': (10, 60), 'ip': (30, 60)},
+}
+# Кэш в памяти считает запросы в каждом процессе отдельно. Общий для
+# процессов кэш точнее, но файловый заметно медленнее, см.
+# benchmarks/ratelimit.py.
+RATE_LIMIT_CACHE = 'ratelimit'
+
+PROFANITY_FILTER = 'news.profanity.RegexFilter'
+# Файл с дополнительными запрещёнными словами, по одному в строке.
+BAD_WORDS_FILE = None
@@ -0,0 +1,44 @@
+"""
+Настройки для продакшена: DJANGO_SETTINGS_MODULE=yanews.settings_production.
+
+Берут всё из yanews/settings.py и меняют то, что в разработке
+должно вести себя иначе.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import ALLOWED_HOSTS, TEMPLATES
+
+DEBUG = False
+
+# Ключ из settings.py лежит в репозитории, а им подписываются cookie
+# сессий signed_cookies, ссылки сброса пароля и токены CSRF.
+SECRET_KEY = os.getenv('YANEWS_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured(
+        'Задайте секретный ключ в переменной окружения YANEWS_SECRET_KEY.'
+    )
+
+ALLOWED_HOSTS = os.getenv(
+    'YANEWS_ALLOWED_HOSTS', ','.join(ALLOWED_HOSTS)
+).split(',')
+
+# Шаблон читается и разбирается один раз за время жизни процесса.
+# Ошибки в шаблонах ловит команда compile_templates при сборке, а
+# yanews/warmup.py заполняет кэш до первого запроса.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    TEMPLATES[0]['OPTIONS']['loaders'],
+                ),
+            ],
+        },
+    },
+]
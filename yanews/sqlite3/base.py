@@ -0,0 +1,20 @@
+"""
+SQLite с настройкой PRAGMA при открытии соединения.
+
+Значения берутся из ключа PRAGMAS в настройках базы данных, например
+{'journal_mode': 'WAL', 'synchronous': 'NORMAL'}.
+"""
+from django.db.backends.sqlite3 import base
+
+
+def apply_pragmas(connection, pragmas):
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, self.settings_dict.get('PRAGMAS', {}))
+        return connection
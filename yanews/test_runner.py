@@ -0,0 +1,31 @@
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Запуск тестов manage.py test.
+
+    Сессии тестов хранятся во временном каталоге, который удаляется
+    после прогона, а не в каталоге кэша сессий из настроек.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.session_dir = TemporaryDirectory()
+        self.session_settings = override_settings(CACHES={
+            **settings.CACHES,
+            'sessions': {
+                **settings.CACHES['sessions'],
+                'LOCATION': self.session_dir.name,
+            },
+        })
+        self.session_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.session_settings.disable()
+        self.session_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,78 @@
+"""
+Прогрев процесса до первого запроса.
+
+Django строит резолвер URL и компилирует шаблоны лениво, и это
+достаётся первому запросу нового процесса. warm_up() делает эту работу
+заранее. Включается переменной окружения YANEWS_WARMUP=1, тогда её
+вызывают yanews/wsgi.py и yanews/asgi.py при импорте приложения.
+
+Шаблоны остаются скомпилированными только с кэширующим загрузчиком из
+yanews/settings_production.py, в разработке прогрев лишь импортирует
+библиотеки тегов.
+
+Соединения с БД при импорте не открываются: под gunicorn --preload их
+унаследовали бы все воркеры после fork, а под ASGI и многопоточными
+серверами они принадлежали бы не тому потоку. warm_database() нужно
+вызывать уже в воркере, например из хука post_worker_init gunicorn.
+"""
+from pathlib import Path
+from time import perf_counter
+
+from django.db import connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import URLResolver, get_resolver
+
+
+def warm_urls(resolver=None):
+    """Импортирует все urls.py и представления, компилирует маршруты."""
+    resolver = resolver or get_resolver()
+    # reverse_dict заполняет резолвер и компилирует регулярные выражения.
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            warm_urls(pattern)
+
+
+def get_template_names(directory):
+    directory = Path(directory)
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob('*.html')
+    )
+
+
+def warm_templates():
+    """Компилирует шаблоны из каталогов DIRS, то есть templates/."""
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.engine.dirs:
+            for name in get_template_names(directory):
+                engine.get_template(name)
+
+
+def warm_database():
+    """
+    Открывает соединения со всеми БД в текущем потоке.
+
+    Вызывается в процессе и потоке, которые будут обслуживать запросы.
+    """
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+STEPS = (
+    ('urls', warm_urls),
+    ('templates', warm_templates),
+)
+
+
+def warm_up():
+    """Выполняет шаги прогрева, возвращает их время в миллисекундах."""
+    timings = {}
+    for name, step in STEPS:
+        start = perf_counter()
+        step()
+        timings[name] = round((perf_counter() - start) * 1000, 1)
+    return timings